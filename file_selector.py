@@ -1,11 +1,32 @@
 
+import concurrent.futures
+import os
+import queue
 import tkinter as tk
 from tkinter import ttk, filedialog
 
+# Same extensions vs_pipeline.find_video_files picks up in batch mode (SUPPORTED_EXTENSIONS)
+VIDEO_EXTENSIONS = ('.avi', '.mov', '.mp4', '.mkv', '.mpg', '.mpeg', '.ts', '.mts', '.m2ts', '.mxf', '.dv', '.hdv')
+
 class FileSelector(ttk.Frame):
+    SCAN_BATCH_SIZE = 100
+    SCAN_POLL_MS = 100
+
     def __init__(self, parent):
         super().__init__(parent, padding="10")
 
+        # Directory scans run here so large or network folders don't block the Tk thread
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.scanned_files = []  # Video files found by the latest batch-mode directory scan
+        self._scan_id = 0
+        # Tkinter isn't thread-safe, so the scan thread hands results over through this queue
+        self._scan_queue = queue.Queue()
+        self._poll_job = None
+
+        # Dialog objects are reused across Browse clicks; they also remember the last directory
+        self._open_dlg = filedialog.Open(self)
+        self._dir_dlg = filedialog.Directory(self)
+
         self.create_widgets()
 
     def create_widgets(self):
@@ -47,6 +68,9 @@ class FileSelector(ttk.Frame):
         skip_check = ttk.Checkbutton(options_frame, text="Skip Existing Files", variable=self.skip_existing)
         skip_check.pack(side="left", padx=5)
 
+        self.scan_status = tk.StringVar()
+        ttk.Label(options_frame, textvariable=self.scan_status).pack(side="left", padx=5)
+
         # Test Mode
         test_mode_frame = ttk.Frame(self)
         test_mode_frame.grid(row=3, column=0, columnspan=3, sticky="w", pady=10)
@@ -65,17 +89,73 @@ class FileSelector(ttk.Frame):
         self.test_frame_label = ttk.Label(test_mode_frame, text="frames", state="disabled")
         self.test_frame_label.pack(side="left")
 
+        self._test_widgets = (self.test_frame_slider, self.test_frame_entry, self.test_frame_label)
+
 
     def browse_input(self):
         if self.processing_mode.get() == "Batch Mode":
-            path = filedialog.askdirectory()
+            path = self._dir_dlg.show()
+            if path:
+                self.scanned_files = []
+                self.scan_status.set("Scanning...")
+                self._scan_id += 1
+                self._pool.submit(self._scan_dir, path, self._scan_id, self.recursive.get())
+                if self._poll_job is None:
+                    self._poll_job = self.after(self.SCAN_POLL_MS, self._poll_scan)
         else:
-            path = filedialog.askopenfilename()
+            path = self._open_dlg.show()
         if path:
             self.input_path.set(path)
 
+    def _scan_dir(self, path, scan_id, recursive):
+        # Runs on the pool thread: no Tk calls here, batches go back through _scan_queue
+        pending_dirs = [path]
+        batch = []
+        while pending_dirs:
+            try:
+                entries = os.scandir(pending_dirs.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    try:
+                        if recursive and entry.is_dir(follow_symlinks=False):
+                            pending_dirs.append(entry.path)
+                        elif entry.name.lower().endswith(VIDEO_EXTENSIONS) and entry.is_file():
+                            batch.append(entry.path)
+                    except OSError:
+                        continue
+                    if len(batch) >= self.SCAN_BATCH_SIZE:
+                        self._scan_queue.put((scan_id, batch, False))
+                        batch = []
+        self._scan_queue.put((scan_id, batch, True))
+
+    def _poll_scan(self):
+        # Drains scan results on the Tk thread; keeps polling until the latest scan reports done
+        self._poll_job = None
+        finished = False
+        while True:
+            try:
+                scan_id, paths, done = self._scan_queue.get_nowait()
+            except queue.Empty:
+                break
+            if scan_id != self._scan_id:
+                continue  # Superseded by a newer directory selection
+            self.scanned_files.extend(paths)
+            if done:
+                finished = True
+                self.scan_status.set(f"{len(self.scanned_files)} video files found")
+        if not finished:
+            self._poll_job = self.after(self.SCAN_POLL_MS, self._poll_scan)
+
+    def destroy(self):
+        if self._poll_job is not None:
+            self.after_cancel(self._poll_job)
+        self._pool.shutdown(wait=False)
+        super().destroy()
+
     def browse_output(self):
-        path = filedialog.askdirectory()
+        path = self._dir_dlg.show()
         if path:
             self.output_path.set(path)
 
@@ -86,10 +166,10 @@ class FileSelector(ttk.Frame):
             self.recursive_check.config(state="disabled")
 
     def toggle_test_mode(self):
-        state = "normal" if self.test_mode.get() else "disabled"
-        self.test_frame_slider.config(state=state)
-        self.test_frame_entry.config(state=state)
-        self.test_frame_label.config(state=state)
+        # ttk state specs flip the flag directly without going through configure()
+        state_spec = ["!disabled"] if self.test_mode.get() else ["disabled"]
+        for widget in self._test_widgets:
+            widget.state(state_spec)
 
 
 if __name__ == '__main__':
@@ -1,20 +1,114 @@
 
+import collections
 import tkinter as tk
 from tkinter import ttk
 
 class LogViewer(ttk.LabelFrame):
+    MAX_LINES = 5000
+    FLUSH_INTERVAL_MS = 50
+    PUMP_BATCH = 500
+    TAG_COLORS = {"warn": "orange", "error": "red"}
+
     def __init__(self, parent, text="Log Viewer", **kwargs):
         super().__init__(parent, text=text, **kwargs)
+        self._buffer = collections.deque(maxlen=self.MAX_LINES)
+        self._pending = []
+        self._flush_job = None
+        # Set when rows were dropped from _pending while hidden; _pump() resyncs once visible again
+        self._stale = False
+        # Cross-thread inbox for log(); bounded so a fast producer never blocks or grows memory
+        self._queue = collections.deque(maxlen=self.MAX_LINES)
         self.create_widgets()
+        self._pump_job = self.after(self.FLUSH_INTERVAL_MS, self._pump)
 
     def create_widgets(self):
-        self.log_text = tk.Text(self, height=10, wrap="word")
+        # Row-based log display: fixed-height rows, no text layout engine or undo journal
+        self.log_text = tk.Listbox(self, height=10, activestyle="none", exportselection=False)
+        x_scrollbar = ttk.Scrollbar(self, orient="horizontal", command=self.log_text.xview)
+        self.log_text.configure(xscrollcommand=x_scrollbar.set)
+        x_scrollbar.pack(side="bottom", fill="x", padx=5)
         self.log_text.pack(fill="both", expand=True, padx=5, pady=5)
 
         # Add some example log entries
-        self.log_text.insert("end", "[2025-07-17 10:00:00] INFO: Application started.\n")
-        self.log_text.insert("end", "[2025-07-17 10:00:05] INFO: VapourSynth script loaded.\n")
-        self.log_text.configure(state="disabled")
+        self.append("[2025-07-17 10:00:00] INFO: Application started.\n")
+        self.append("[2025-07-17 10:00:05] INFO: VapourSynth script loaded.\n")
+
+    @staticmethod
+    def _tag_for(line):
+        if "ERROR" in line:
+            return "error"
+        if "WARN" in line:
+            return "warn"
+        return "info"
+
+    def log(self, line):
+        # Safe to call from worker threads; lines are drained on the Tk thread by _pump()
+        self._queue.append(line)
+
+    def append(self, line):
+        self._enqueue(line)
+        # Coalesce bursts of appends into a single insert/redraw
+        if self._flush_job is None:
+            self._flush_job = self.after(self.FLUSH_INTERVAL_MS, self._flush)
+
+    def _enqueue(self, line):
+        # Entries are (text, tag) pairs; each one becomes a single Listbox row
+        entry = (line.rstrip("\n"), self._tag_for(line))
+        self._buffer.append(entry)
+        self._pending.append(entry)
+
+    def _pump(self):
+        queue = self._queue
+        drained = 0
+        while queue and drained < self.PUMP_BATCH:
+            self._enqueue(queue.popleft())
+            drained += 1
+        if drained or self._stale:
+            self._flush()
+        self._pump_job = self.after(self.FLUSH_INTERVAL_MS, self._pump)
+
+    def _flush(self):
+        self._flush_job = None
+        # Skip all widget work while hidden; the buffer stays authoritative. Minimizing the
+        # toplevel sends no <Map> to this frame on restore, so visibility is re-checked from
+        # _pump() rather than relying on an event
+        if not self.winfo_viewable():
+            if self._pending:
+                self._pending = []
+                self._stale = True
+            return
+        if self._stale:
+            self._resync()
+            return
+        pending = self._pending
+        self._pending = []
+        if pending:
+            self._insert_rows(pending)
+
+    def _insert_rows(self, entries):
+        start = self.log_text.size()
+        self.log_text.insert("end", *(text for text, _ in entries))
+        for offset, (_, tag) in enumerate(entries):
+            color = self.TAG_COLORS.get(tag)
+            if color:
+                self.log_text.itemconfigure(start + offset, foreground=color)
+        overflow = self.log_text.size() - self.MAX_LINES
+        if overflow > 0:
+            self.log_text.delete(0, overflow - 1)
+        self.log_text.see("end")
+
+    def _resync(self, event=None):
+        self._pending.clear()
+        self._stale = False
+        self.log_text.delete(0, "end")
+        if self._buffer:
+            self._insert_rows(self._buffer)
+
+    def destroy(self):
+        self.after_cancel(self._pump_job)
+        if self._flush_job is not None:
+            self.after_cancel(self._flush_job)
+        super().destroy()
 
 if __name__ == '__main__':
     root = tk.Tk()
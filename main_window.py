@@ -9,6 +9,11 @@ from components.settings_window import SettingsWindow
 import sys
 import os
 
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_ICON_DIR = os.path.join(_HERE, "icons")
+_ICON_32 = os.path.join(_ICON_DIR, "32x32.png")
+_ICON_ICO = os.path.join(_ICON_DIR, "icon.ico")
+
 class App(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -18,19 +23,32 @@ class App(tk.Tk):
         # App-wide configuration
         self.python_executable_path = tk.StringVar()
 
+        self.create_widgets()
+
+        # Load icons once the window has painted so startup doesn't wait on disk I/O
+        self.after_idle(self._load_icons)
+
+    def _load_icons(self):
+        # Decode the PNG once; it serves as both the window and the title icon
+        try:
+            self.icon_32 = tk.PhotoImage(file=_ICON_32)
+        except tk.TclError as e:
+            print(f"Title icon not found: {e}")
+            self.icon_32 = None
+
         # Set application icon
         try:
             if sys.platform == "darwin":
-                icon_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "icons", "32x32.png"))
-                self.icon = tk.PhotoImage(file=icon_path)
-                self.iconphoto(True, self.icon)
+                if self.icon_32 is not None:
+                    self.iconphoto(True, self.icon_32)
             else:
-                icon_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "icons", "icon.ico"))
-                self.iconbitmap(icon_path)
+                self.iconbitmap(_ICON_ICO)
         except tk.TclError as e:
             print(f"Icon not found, skipping icon setting: {e}")
 
-        self.create_widgets()
+        if self.icon_32 is not None:
+            icon_label = ttk.Label(self.title_container, image=self.icon_32)
+            icon_label.pack(side="left", padx=(0, 5), before=self.title_label)
 
     def open_settings(self):
         SettingsWindow(self)
@@ -42,19 +60,12 @@ class App(tk.Tk):
         header_frame.columnconfigure(0, weight=1)
 
         # Title and Icon (Row 0)
-        title_container = ttk.Frame(header_frame)
-        title_container.grid(row=0, column=0, pady=(0, 10))
-
-        try:
-            icon_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "icons", "32x32.png"))
-            self.title_icon = tk.PhotoImage(file=icon_path)
-            icon_label = ttk.Label(title_container, image=self.title_icon)
-            icon_label.pack(side="left", padx=(0, 5))
-        except tk.TclError:
-            print("Title icon not found.")
+        self.title_container = ttk.Frame(header_frame)
+        self.title_container.grid(row=0, column=0, pady=(0, 10))
 
-        title_label = ttk.Label(title_container, text="HDVapourize", font=("", 16, "bold"))
-        title_label.pack(side="left")
+        # The title icon is added in front of this label by _load_icons()
+        self.title_label = ttk.Label(self.title_container, text="HDVapourize", font=("", 16, "bold"))
+        self.title_label.pack(side="left")
 
         # Action Buttons (Row 1)
         button_container = ttk.Frame(header_frame)
@@ -91,12 +102,22 @@ class App(tk.Tk):
         param_frame = ParameterPanel(param_canvas)
         param_window = param_canvas.create_window((0, 0), window=param_frame, anchor="nw")
 
-        def on_canvas_configure(event):
-            canvas_width = event.width
-            param_canvas.itemconfig(param_window, width=canvas_width)
+        # Resizing fires <Configure> for every pixel; coalesce both bindings into
+        # one width/scrollregion update once the resize settles
+        self._resize_job = None
+
+        def apply_resize():
+            self._resize_job = None
+            param_canvas.itemconfig(param_window, width=param_canvas.winfo_width())
+            param_canvas.configure(scrollregion=param_canvas.bbox("all"))
+
+        def on_configure(event):
+            if self._resize_job is not None:
+                self.after_cancel(self._resize_job)
+            self._resize_job = self.after(30, apply_resize)
 
-        param_canvas.bind("<Configure>", on_canvas_configure)
-        param_frame.bind("<Configure>", lambda e: param_canvas.configure(scrollregion=param_canvas.bbox("all")))
+        param_canvas.bind("<Configure>", on_configure)
+        param_frame.bind("<Configure>", on_configure)
 
 
         # Progress and Status Region
@@ -1,7 +1,77 @@
 
 import tkinter as tk
+from collections import namedtuple
 from tkinter import ttk
 
+# Slider value formatter, bound once instead of building an f-string per motion event
+_FMT2 = "{:.2f}".format
+
+# Declarative widget specs; each panel is a tuple of these built by ParameterPanel._build_widgets
+# Slider variables are IntVar or DoubleVar according to the type of their default
+_SliderSpec = namedtuple("_SliderSpec", "attr text from_ to default row")
+_ComboSpec = namedtuple("_ComboSpec", "attr text default values row columnspan", defaults=(2,))
+_CheckSpec = namedtuple("_CheckSpec", "attr text default row column")
+_RadioSpec = namedtuple("_RadioSpec", "attr text default options row")
+
+_QTGMC_WIDGETS = (
+    _ComboSpec("qtgmc_preset", "Preset:", "Placebo", ("Draft", "Fast", "Medium", "Slow", "Slower", "Placebo"), 0),
+    _RadioSpec("field_order", "Field Order:", "Top Field First (TFF)",
+               (("Auto-detect", "Auto-detect"), ("TFF", "Top Field First (TFF)"), ("BFF", "Bottom Field First (BFF)")), 1),
+    # Sliders
+    _SliderSpec("source_matching", "Source Matching:", 0, 3, 3.0, 2),
+    _SliderSpec("lossless_mode", "Lossless Mode:", 0, 2, 2, 3),
+    _SliderSpec("sharpening_control", "Sharpening:", 0.0, 2.0, 0.0, 4),
+    # Motion Analysis
+    _SliderSpec("match_enhancement", "Match Enhancement:", 0.0, 1.0, 0.95, 5),
+    _SliderSpec("tr0", "Base Temporal Radius:", 0, 3, 2, 6),
+    _SliderSpec("tr1", "Motion Search Radius:", 0, 3, 2, 7),
+    _SliderSpec("tr2", "Post-Process Radius:", 0, 3, 2, 8),
+    # Noise Processing
+    _CheckSpec("enable_noise_processing", "Enable Noise Processing", True, 9, 0),
+    _SliderSpec("noise_restoration", "Noise Restoration:", 0.0, 1.0, 0.3, 10),
+    _SliderSpec("ez_denoise", "EZ Denoise:", 0.0, 10.0, 0.0, 11),
+    # Chroma Processing
+    _CheckSpec("chroma_motion", "Chroma Motion", True, 12, 0),
+    _CheckSpec("chroma_noise", "Chroma Noise", True, 12, 1),
+    _CheckSpec("precise_mode", "Precise Mode", True, 12, 2),
+    # Repair Settings
+    _SliderSpec("rep0", "Primary Repair:", 0, 5, 4, 13),
+    _SliderSpec("rep2", "Secondary Repair:", 0, 5, 4, 14),
+    # Border Handling
+    _CheckSpec("border_handling", "Border Handling", True, 15, 0),
+    # Frame Rate Conversion
+    _ComboSpec("frame_rate", "Frame Rate:", "Convert to Half", ("Keep Original", "Convert to Half"), 16),
+)
+
+_CHROMA_WIDGETS = (
+    _SliderSpec("prev_frame_weight", "Previous Frame Weight:", 0.0, 1.0, 0.3, 0),
+    _SliderSpec("two_frame_weight", "Two-Frame Weight:", 0.0, 1.0, 0.2, 1),
+    _ComboSpec("vertical_strength", "Vertical Strength:", "Medium", ("Light", "Medium", "Strong"), 2),
+    _SliderSpec("aggressive_mode_thresh", "Aggressive Mode Threshold:", 1, 10, 3, 3),
+    _CheckSpec("horizontal_smoothing", "Horizontal Smoothing", True, 4, 0),
+    _SliderSpec("horizontal_blend", "Horizontal Blend:", 0.0, 1.0, 0.5, 5),
+)
+
+_UPSCALE_WIDGETS = (
+    _ComboSpec("nn_size", "Neural Network Size:", "32x6", ("8x6", "16x6", "32x6", "64x6"), 0),
+    _ComboSpec("neuron_count", "Neuron Count:", "256", ("16", "32", "64", "128", "256"), 1),
+    _SliderSpec("quality_level", "Quality Level:", 1, 2, 2, 2),
+    _RadioSpec("edge_type", "Edge Type:", "Rectangle", (("Rectangle", "Rectangle"), ("Ellipse", "Ellipse")), 3),
+    _RadioSpec("field_processing", "Field Processing:", "Top Field",
+               (("Auto", "Auto"), ("Top Field", "Top Field"), ("Bottom Field", "Bottom Field")), 4),
+)
+
+_FORMAT_WIDGETS = (
+    _ComboSpec("output_format", "Output Format:", "YUV422P10", ("YUV422P10", "YUV444P10", "YUV420P10"), 0, 1),
+    _ComboSpec("dithering", "Dithering Method:", "Error Diffusion", ("None", "Ordered", "Error Diffusion"), 1, 1),
+)
+
+_ADVANCED_WIDGETS = (
+    _CheckSpec("debug_output", "Enable Debug Output", False, 0, 0),
+    _CheckSpec("gpu_monitoring", "GPU Memory Monitoring", False, 0, 1),
+    _CheckSpec("performance_profiling", "Performance Profiling", False, 0, 2),
+)
+
 class ParameterPanel(ttk.Frame):
     def __init__(self, parent):
         super().__init__(parent, padding="10")
@@ -41,14 +111,53 @@ class ParameterPanel(ttk.Frame):
         adv_frame.grid(row=3, column=1, sticky="new", padx=5, pady=5)
         self.create_advanced_widgets(adv_frame)
 
+    def _make_var(self, default):
+        return tk.IntVar(value=default) if isinstance(default, int) else tk.DoubleVar(value=default)
+
+    def _make_slider(self, parent, spec):
+        var = self._make_var(spec.default)
+        self._create_slider(parent, spec.text, spec.from_, spec.to, spec.default, var, spec.row, 0)
+        return var
+
     def _create_slider(self, parent, text, from_, to, default, var, row, col):
         ttk.Label(parent, text=text).grid(row=row, column=col, sticky="w")
-        var.set(default)
         slider = ttk.Scale(parent, from_=from_, to=to, orient="horizontal", variable=var)
         slider.grid(row=row, column=col+1, sticky="ew", padx=5)
         label = ttk.Label(parent, text=f"{default}")
         label.grid(row=row, column=col+2, sticky="w")
-        slider.configure(command=lambda v, l=label: l.config(text=f"{float(v):.2f}"))
+
+        # Scale fires on every mouse motion; only touch the label when the shown text changes
+        last_text = [None]
+
+        def on_slide(v, fmt=_FMT2):
+            text = fmt(float(v))
+            if text != last_text[0]:
+                label.config(text=text)
+                last_text[0] = text
+
+        slider.configure(command=on_slide)
+
+    def _build_widgets(self, parent, specs):
+        for spec in specs:
+            if isinstance(spec, _SliderSpec):
+                var = self._make_slider(parent, spec)
+            elif isinstance(spec, _ComboSpec):
+                ttk.Label(parent, text=spec.text).grid(row=spec.row, column=0, sticky="w")
+                var = tk.StringVar(value=spec.default)
+                ttk.Combobox(parent, textvariable=var, values=spec.values).grid(row=spec.row, column=1, columnspan=spec.columnspan, sticky="ew")
+            elif isinstance(spec, _CheckSpec):
+                var = tk.BooleanVar(value=spec.default)
+                ttk.Checkbutton(parent, text=spec.text, variable=var).grid(row=spec.row, column=spec.column, sticky="w")
+            elif isinstance(spec, _RadioSpec):
+                ttk.Label(parent, text=spec.text).grid(row=spec.row, column=0, sticky="w")
+                var = tk.StringVar(value=spec.default)
+                radio_frame = ttk.Frame(parent)
+                radio_frame.grid(row=spec.row, column=1, columnspan=2, sticky="ew")
+                for text, value in spec.options:
+                    ttk.Radiobutton(radio_frame, text=text, variable=var, value=value).pack(side="left", padx=5)
+            else:
+                raise TypeError(f"Unknown widget spec: {spec!r}")
+            setattr(self, spec.attr, var)
 
     def create_performance_widgets(self, parent):
         parent.columnconfigure(1, weight=1)
@@ -64,142 +173,26 @@ class ParameterPanel(ttk.Frame):
 
     def create_qtgmc_widgets(self, parent):
         parent.columnconfigure(1, weight=1)
-        
-        # Preset
-        ttk.Label(parent, text="Preset:").grid(row=0, column=0, sticky="w")
-        self.qtgmc_preset = tk.StringVar(value="Placebo")
-        ttk.Combobox(parent, textvariable=self.qtgmc_preset, values=["Draft", "Fast", "Medium", "Slow", "Slower", "Placebo"]).grid(row=0, column=1, columnspan=2, sticky="ew")
-
-        # Field Order
-        ttk.Label(parent, text="Field Order:").grid(row=1, column=0, sticky="w")
-        self.field_order = tk.StringVar(value="Top Field First (TFF)")
-        field_order_frame = ttk.Frame(parent)
-        field_order_frame.grid(row=1, column=1, columnspan=2, sticky="ew")
-        ttk.Radiobutton(field_order_frame, text="Auto-detect", variable=self.field_order, value="Auto-detect").pack(side="left", padx=5)
-        ttk.Radiobutton(field_order_frame, text="TFF", variable=self.field_order, value="Top Field First (TFF)").pack(side="left", padx=5)
-        ttk.Radiobutton(field_order_frame, text="BFF", variable=self.field_order, value="Bottom Field First (BFF)").pack(side="left", padx=5)
-
-        # Sliders
-        self.source_matching = tk.DoubleVar()
-        self._create_slider(parent, "Source Matching:", 0, 3, 3, self.source_matching, 2, 0)
-        self.lossless_mode = tk.IntVar()
-        self._create_slider(parent, "Lossless Mode:", 0, 2, 2, self.lossless_mode, 3, 0)
-        self.sharpening_control = tk.DoubleVar()
-        self._create_slider(parent, "Sharpening:", 0.0, 2.0, 0.0, self.sharpening_control, 4, 0)
-
-        # Motion Analysis
-        self.match_enhancement = tk.DoubleVar()
-        self._create_slider(parent, "Match Enhancement:", 0.0, 1.0, 0.95, self.match_enhancement, 5, 0)
-        self.tr0 = tk.IntVar()
-        self._create_slider(parent, "Base Temporal Radius:", 0, 3, 2, self.tr0, 6, 0)
-        self.tr1 = tk.IntVar()
-        self._create_slider(parent, "Motion Search Radius:", 0, 3, 2, self.tr1, 7, 0)
-        self.tr2 = tk.IntVar()
-        self._create_slider(parent, "Post-Process Radius:", 0, 3, 2, self.tr2, 8, 0)
-
-        # Noise Processing
-        self.enable_noise_processing = tk.BooleanVar(value=True)
-        ttk.Checkbutton(parent, text="Enable Noise Processing", variable=self.enable_noise_processing).grid(row=9, column=0, sticky="w")
-        self.noise_restoration = tk.DoubleVar()
-        self._create_slider(parent, "Noise Restoration:", 0.0, 1.0, 0.3, self.noise_restoration, 10, 0)
-        self.ez_denoise = tk.DoubleVar()
-        self._create_slider(parent, "EZ Denoise:", 0.0, 10.0, 0.0, self.ez_denoise, 11, 0)
-
-        # Chroma Processing
-        self.chroma_motion = tk.BooleanVar(value=True)
-        ttk.Checkbutton(parent, text="Chroma Motion", variable=self.chroma_motion).grid(row=12, column=0, sticky="w")
-        self.chroma_noise = tk.BooleanVar(value=True)
-        ttk.Checkbutton(parent, text="Chroma Noise", variable=self.chroma_noise).grid(row=12, column=1, sticky="w")
-        self.precise_mode = tk.BooleanVar(value=True)
-        ttk.Checkbutton(parent, text="Precise Mode", variable=self.precise_mode).grid(row=12, column=2, sticky="w")
-
-        # Repair Settings
-        self.rep0 = tk.IntVar()
-        self._create_slider(parent, "Primary Repair:", 0, 5, 4, self.rep0, 13, 0)
-        self.rep2 = tk.IntVar()
-        self._create_slider(parent, "Secondary Repair:", 0, 5, 4, self.rep2, 14, 0)
-
-        # Border Handling
-        self.border_handling = tk.BooleanVar(value=True)
-        ttk.Checkbutton(parent, text="Border Handling", variable=self.border_handling).grid(row=15, column=0, sticky="w")
-
-        # Frame Rate Conversion
-        ttk.Label(parent, text="Frame Rate:").grid(row=16, column=0, sticky="w")
-        self.frame_rate = tk.StringVar(value="Convert to Half")
-        ttk.Combobox(parent, textvariable=self.frame_rate, values=["Keep Original", "Convert to Half"]).grid(row=16, column=1, columnspan=2, sticky="ew")
-
+        self._build_widgets(parent, _QTGMC_WIDGETS)
 
     def create_chroma_cleanup_widgets(self, parent):
         parent.columnconfigure(1, weight=1)
-        self.prev_frame_weight = tk.DoubleVar()
-        self._create_slider(parent, "Previous Frame Weight:", 0.0, 1.0, 0.3, self.prev_frame_weight, 0, 0)
-        self.two_frame_weight = tk.DoubleVar()
-        self._create_slider(parent, "Two-Frame Weight:", 0.0, 1.0, 0.2, self.two_frame_weight, 1, 0)
-
-        ttk.Label(parent, text="Vertical Strength:").grid(row=2, column=0, sticky="w")
-        self.vertical_strength = tk.StringVar(value="Medium")
-        ttk.Combobox(parent, textvariable=self.vertical_strength, values=["Light", "Medium", "Strong"]).grid(row=2, column=1, columnspan=2, sticky="ew")
-        
-        self.aggressive_mode_thresh = tk.IntVar()
-        self._create_slider(parent, "Aggressive Mode Threshold:", 1, 10, 3, self.aggressive_mode_thresh, 3, 0)
-
-        self.horizontal_smoothing = tk.BooleanVar(value=True)
-        ttk.Checkbutton(parent, text="Horizontal Smoothing", variable=self.horizontal_smoothing).grid(row=4, column=0, sticky="w")
-        self.horizontal_blend = tk.DoubleVar()
-        self._create_slider(parent, "Horizontal Blend:", 0.0, 1.0, 0.5, self.horizontal_blend, 5, 0)
-
+        self._build_widgets(parent, _CHROMA_WIDGETS)
 
     def create_upscaling_widgets(self, parent):
         parent.columnconfigure(1, weight=1)
-        ttk.Label(parent, text="Neural Network Size:").grid(row=0, column=0, sticky="w")
-        self.nn_size = tk.StringVar(value="32x6")
-        ttk.Combobox(parent, textvariable=self.nn_size, values=["8x6", "16x6", "32x6", "64x6"]).grid(row=0, column=1, columnspan=2, sticky="ew")
-
-        ttk.Label(parent, text="Neuron Count:").grid(row=1, column=0, sticky="w")
-        self.neuron_count = tk.StringVar(value="256")
-        ttk.Combobox(parent, textvariable=self.neuron_count, values=["16", "32", "64", "128", "256"]).grid(row=1, column=1, columnspan=2, sticky="ew")
-
-        self.quality_level = tk.IntVar()
-        self._create_slider(parent, "Quality Level:", 1, 2, 2, self.quality_level, 2, 0)
-
-        ttk.Label(parent, text="Edge Type:").grid(row=3, column=0, sticky="w")
-        self.edge_type = tk.StringVar(value="Rectangle")
-        edge_type_frame = ttk.Frame(parent)
-        edge_type_frame.grid(row=3, column=1, columnspan=2, sticky="ew")
-        ttk.Radiobutton(edge_type_frame, text="Rectangle", variable=self.edge_type, value="Rectangle").pack(side="left", padx=5)
-        ttk.Radiobutton(edge_type_frame, text="Ellipse", variable=self.edge_type, value="Ellipse").pack(side="left", padx=5)
-
-        ttk.Label(parent, text="Field Processing:").grid(row=4, column=0, sticky="w")
-        self.field_processing = tk.StringVar(value="Top Field")
-        field_proc_frame = ttk.Frame(parent)
-        field_proc_frame.grid(row=4, column=1, columnspan=2, sticky="ew")
-        ttk.Radiobutton(field_proc_frame, text="Auto", variable=self.field_processing, value="Auto").pack(side="left", padx=5)
-        ttk.Radiobutton(field_proc_frame, text="Top Field", variable=self.field_processing, value="Top Field").pack(side="left", padx=5)
-        ttk.Radiobutton(field_proc_frame, text="Bottom Field", variable=self.field_processing, value="Bottom Field").pack(side="left", padx=5)
-
+        self._build_widgets(parent, _UPSCALE_WIDGETS)
 
     def create_format_widgets(self, parent):
         parent.columnconfigure(1, weight=1)
-        ttk.Label(parent, text="Output Format:").grid(row=0, column=0, sticky="w")
-        self.output_format = tk.StringVar(value="YUV422P10")
-        ttk.Combobox(parent, textvariable=self.output_format, values=["YUV422P10", "YUV444P10", "YUV420P10"]).grid(row=0, column=1, sticky="ew")
-
-        ttk.Label(parent, text="Dithering Method:").grid(row=1, column=0, sticky="w")
-        self.dithering = tk.StringVar(value="Error Diffusion")
-        ttk.Combobox(parent, textvariable=self.dithering, values=["None", "Ordered", "Error Diffusion"]).grid(row=1, column=1, sticky="ew")
+        self._build_widgets(parent, _FORMAT_WIDGETS)
 
         ttk.Label(parent, text="Color Space Handling:", justify="left", anchor="w").grid(row=2, column=0, sticky="w")
         ttk.Label(parent, text="DCI-P3 properties are applied during final FFmpeg encoding.", justify="left").grid(row=2, column=1, sticky="w")
 
-
     def create_advanced_widgets(self, parent):
         parent.columnconfigure(1, weight=1)
-        self.debug_output = tk.BooleanVar(value=False)
-        ttk.Checkbutton(parent, text="Enable Debug Output", variable=self.debug_output).grid(row=0, column=0, sticky="w")
-        self.gpu_monitoring = tk.BooleanVar(value=False)
-        ttk.Checkbutton(parent, text="GPU Memory Monitoring", variable=self.gpu_monitoring).grid(row=0, column=1, sticky="w")
-        self.performance_profiling = tk.BooleanVar(value=False)
-        ttk.Checkbutton(parent, text="Performance Profiling", variable=self.performance_profiling).grid(row=0, column=2, sticky="w")
+        self._build_widgets(parent, _ADVANCED_WIDGETS)
 
 
 if __name__ == '__main__':
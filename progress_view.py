@@ -3,9 +3,15 @@ import tkinter as tk
 from tkinter import ttk
 
 class ProgressView(ttk.Frame):
+    # Label templates bound once; progress ticks only fill in the fields
+    _FILE_FMT = "{done}/{total} frames | {fps:.1f} fps | ETA: {eta}".format_map
+    _BATCH_FMT = "{done}/{total} files | Avg time: {avg} | Total ETA: {eta}".format_map
+
     def __init__(self, parent):
         super().__init__(parent, padding="10")
 
+        self._file_text = None
+        self._batch_text = None
         self.create_widgets()
 
     def create_widgets(self):
@@ -32,6 +38,20 @@ class ProgressView(ttk.Frame):
         self.batch_progress_label = ttk.Label(batch_progress_frame, text="0/0 files | Avg time: --:--:-- | Total ETA: --:--:--")
         self.batch_progress_label.grid(row=0, column=1, sticky="w", padx=5)
 
+    def update_file_progress(self, done, total, fps, eta):
+        self.file_progress_bar.configure(maximum=max(total, 1), value=done)
+        text = self._FILE_FMT({"done": done, "total": total, "fps": fps, "eta": eta})
+        if text != self._file_text:
+            self.file_progress_label.config(text=text)
+            self._file_text = text
+
+    def update_batch_progress(self, done, total, avg, eta):
+        self.batch_progress_bar.configure(maximum=max(total, 1), value=done)
+        text = self._BATCH_FMT({"done": done, "total": total, "avg": avg, "eta": eta})
+        if text != self._batch_text:
+            self.batch_progress_label.config(text=text)
+            self._batch_text = text
+
 if __name__ == '__main__':
     root = tk.Tk()
     root.title("Progress View Test")
@@ -1,37 +1,235 @@
 import subprocess
 import os
 import sys
+import json
+import re
+import atexit
+import threading
+from functools import lru_cache
+
+# Keep ffprobe/ffmpeg from opening (and flashing) a console window on Windows
+_CREATE_FLAGS = subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+
+def probe(source_file):
+    """
+    Run a single ffprobe over the source file and return its parsed JSON output.
+    The result contains 'format' and the first video stream in 'streams'.
+    Results are memoized per (path, size, mtime), so repeat calls for an unchanged
+    file don't spawn ffprobe again. Returns None if the file could not be probed.
+    """
+    # Absolute path so the cache key names the same file whatever the working directory
+    source_file = os.path.abspath(source_file)
+    try:
+        st = os.stat(source_file)
+    except OSError as e:
+        print(f"Error probing file: {e}", file=sys.stderr)
+        return None
+    return _probe_cached(source_file, st.st_size, st.st_mtime_ns)
+
+# Keep ffprobe from reading the default 5 MB / 5 s of stream when only header fields are needed.
+# analyzeduration is in microseconds; 0 would mean "use the default", not "don't analyze".
+PROBE_LIMIT_ARGS = [
+    '-probesize', '1000000',
+    '-analyzeduration', '500000',
+]
+# Seconds to wait for each ffprobe run; a run that times out is not retried at full depth
+PROBE_TIMEOUT = 10
+
+# Persistent layer under the in-memory cache, keyed by "path:size:mtime_ns"; see load_probe_cache()
+_disk_cache = {}
+_disk_cache_path = None
+_disk_cache_dirty = False
+_disk_cache_used = set()  # Keys looked up or stored this run; only these are written back
+_disk_cache_lock = threading.Lock()
+
+def load_probe_cache(cache_path):
+    """
+    Load probe results persisted by a previous run from cache_path (a JSON file),
+    and arrange for the cache to be written back there at exit.
+    """
+    global _disk_cache_path
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        data = {}
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable probe cache {cache_path}: {e}", file=sys.stderr)
+        data = {}
+
+    with _disk_cache_lock:
+        if isinstance(data, dict):
+            _disk_cache.update(data)
+        if _disk_cache_path is None:
+            atexit.register(save_probe_cache)
+        _disk_cache_path = cache_path
+
+def save_probe_cache():
+    """
+    Write the probe cache back to the path given to load_probe_cache(), if anything changed.
+    Entries not used during this run are dropped, so the file doesn't grow without bound.
+    """
+    global _disk_cache_dirty
+    with _disk_cache_lock:
+        # A run that probed nothing (e.g. one that stopped early) leaves the file as it was
+        if not _disk_cache_path or not _disk_cache_used:
+            return
+        if not _disk_cache_dirty and len(_disk_cache_used) == len(_disk_cache):
+            return
+        snapshot = {key: _disk_cache[key] for key in _disk_cache_used if key in _disk_cache}
+        _disk_cache_dirty = False
+
+    tmp_path = _disk_cache_path + '.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, _disk_cache_path)
+    except OSError as e:
+        print(f"Error saving probe cache: {e}", file=sys.stderr)
+
+@lru_cache(maxsize=256)
+def _probe_cached(source_file, size, mtime_ns):
+    # size and mtime_ns are only part of the cache key; a modified file gets a fresh probe
+    global _disk_cache_dirty
+    key = f"{source_file}:{size}:{mtime_ns}"
+    with _disk_cache_lock:
+        cached = _disk_cache.get(key)
+        if cached is not None:
+            _disk_cache_used.add(key)
+    if cached is not None:
+        return cached
+
+    # Header fields are all we need, so probe shallowly first and only go full-depth
+    # when the shallow pass failed or couldn't identify the video stream. A stalled file
+    # (slow share, damaged data) would stall the deeper pass too, so a timeout ends it.
+    probe_data = None
+    try:
+        probe_data = _run_ffprobe(source_file, PROBE_LIMIT_ARGS, PROBE_TIMEOUT)
+        if probe_data is None or not _has_stream_info(probe_data):
+            probe_data = _run_ffprobe(source_file, [], PROBE_TIMEOUT) or probe_data
+    except subprocess.TimeoutExpired:
+        pass
+    if probe_data is None:
+        return None
+
+    with _disk_cache_lock:
+        _disk_cache[key] = probe_data
+        _disk_cache_used.add(key)
+        _disk_cache_dirty = True
+    return probe_data
+
+def _has_stream_info(probe_data):
+    """True if a probe has every field callers read: codec, frame size, and a frame count or rate"""
+    stream = (probe_data.get('streams') or [{}])[0]
+    if not (stream.get('codec_name') and stream.get('width') and stream.get('height')):
+        return False
+    if str(stream.get('nb_frames', '')).isdigit():
+        return True
+    # get_frame_count's fallback needs a duration and a usable frame rate
+    duration = str(probe_data.get('format', {}).get('duration', '')).strip().lower()
+    frame_rate = str(stream.get('r_frame_rate', '')).strip()
+    return duration not in ('', 'n/a') and frame_rate not in ('', '0/0')
+
+def _run_ffprobe(source_file, extra_args, timeout):
+    cmd = [
+        'ffprobe',
+        '-v', 'error',
+        *extra_args,
+        '-select_streams', 'v:0',
+        '-print_format', 'json',
+        '-show_format',
+        '-show_streams',
+        source_file
+    ]
+
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                                creationflags=_CREATE_FLAGS)
+    except OSError as e:
+        print(f"Error probing file: {e}", file=sys.stderr)
+        return None
+
+    try:
+        stdout, stderr = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        # Bail out early on damaged or slow files instead of waiting for ffprobe to give up
+        proc.kill()
+        proc.communicate()
+        print(f"Error probing file: ffprobe timed out after {timeout}s on {source_file}", file=sys.stderr)
+        raise
+
+    if proc.returncode != 0:
+        print(f"Error probing file: ffprobe exited with status {proc.returncode}", file=sys.stderr)
+        print(f"ffprobe stderr: {stderr}", file=sys.stderr)
+        return None
+
+    try:
+        return json.loads(stdout)
+    except ValueError as e:
+        print(f"Error probing file: {e}", file=sys.stderr)
+        return None
 
 def get_video_info(source_file):
     """
     Get video information from the source file to make informed decisions about rewrapping.
-    Returns a dictionary with video properties.
+    Returns a dictionary with the video stream properties plus the container format_name.
     """
-    try:
-        cmd = [
-            'ffprobe',
-            '-v', 'error',
-            '-select_streams', 'v:0',
-            '-show_entries', 'stream=codec_name,pix_fmt,width,height,field_order,r_frame_rate',
-            '-show_entries', 'format=format_name',
-            '-of', 'default=noprint_wrappers=1',
-            source_file
-        ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        
-        info = {}
-        for line in result.stdout.strip().split('\n'):
-            if '=' in line:
-                key, value = line.split('=', 1)
-                info[key] = value
-        
-        return info
-    except subprocess.CalledProcessError as e:
-        print(f"Error getting video info: {e}", file=sys.stderr)
-        print(f"ffprobe stderr: {e.stderr}", file=sys.stderr)
+    probe_data = probe(source_file)
+    if not probe_data:
         return None
 
+    streams = probe_data.get('streams') or [{}]
+    info = dict(streams[0])
+    info['format_name'] = probe_data.get('format', {}).get('format_name', '')
+    return info
+
+# Color tags written by rewrap_to_prores (-color_primaries 12 -color_trc 11 -colorspace 12
+# -color_range tv), under the names ffprobe reports them
+TARGET_COLOR_TAGS = {
+    'color_primaries': 'smpte432',
+    'color_transfer': 'iec61966-2-4',
+    'color_space': 'chroma-derived-nc',
+    'color_range': 'tv',
+}
+
+def is_prores_mov(source_file, video_info):
+    """
+    Check whether the source is already ProRes in a QuickTime (.mov) container.
+    """
+    if not video_info:
+        return False
+    format_name = video_info.get('format_name', '').lower()
+    codec_name = video_info.get('codec_name', '').lower()
+    file_ext = os.path.splitext(source_file)[1].lower()
+    is_quicktime = 'mov' in format_name or 'quicktime' in format_name
+    return is_quicktime and 'prores' in codec_name and file_ext == '.mov'
+
+def has_target_color_tags(video_info):
+    """
+    Check whether the video stream already carries the DCI-P3 color tags we encode with.
+    """
+    return all(video_info.get(key) == value for key, value in TARGET_COLOR_TAGS.items())
+
+# Always rewrap these formats/extensions
+REWRAP_FORMATS = [
+    'avi',           # AVI containers
+    'matroska',      # MKV files
+    'mp4',           # MP4 files
+    'mpeg',          # MPEG files
+    'mpegts',        # Transport streams
+    'mxf',           # MXF files
+]
+
+REWRAP_EXTENSIONS = [
+    '.avi', '.mkv', '.mp4', '.m4v', '.mpg', '.mpeg', 
+    '.ts', '.mts', '.m2ts', '.mxf', '.dv', '.hdv'
+]
+
+# Precompiled once so each per-file check is a single C-level scan/lookup
+_REWRAP_FMT_RE = re.compile('|'.join(map(re.escape, REWRAP_FORMATS)))
+_REWRAP_EXT = frozenset(REWRAP_EXTENSIONS)
+_KNOWN_FIELD_ORDERS = frozenset(['tt', 'bb', 'tb', 'bt', 'progressive'])
+
 def needs_rewrapping(source_file, video_info):
     """
     Determine if the file needs rewrapping based on format and codec.
@@ -50,31 +248,19 @@ def needs_rewrapping(source_file, video_info):
     
     print(f"File analysis: format={format_name}, codec={codec_name}, extension={file_ext}")
     
-    # Always rewrap these formats/extensions
-    needs_rewrap_formats = [
-        'avi',           # AVI containers
-        'matroska',      # MKV files
-        'mp4',           # MP4 files
-        'mpeg',          # MPEG files
-        'mpegts',        # Transport streams
-        'mxf',           # MXF files
-    ]
-    
-    needs_rewrap_extensions = [
-        '.avi', '.mkv', '.mp4', '.m4v', '.mpg', '.mpeg', 
-        '.ts', '.mts', '.m2ts', '.mxf', '.dv', '.hdv'
-    ]
-    
     # Check if format or extension indicates rewrapping is needed
-    format_needs_rewrap = any(fmt in format_name for fmt in needs_rewrap_formats)
-    extension_needs_rewrap = file_ext in needs_rewrap_extensions
+    format_needs_rewrap = _REWRAP_FMT_RE.search(format_name) is not None
+    extension_needs_rewrap = file_ext in _REWRAP_EXT
     
     # Already in MOV/QuickTime format with ProRes? Check if we can skip
     if 'mov' in format_name or 'quicktime' in format_name:
-        if 'prores' in codec_name:
+        if is_prores_mov(source_file, video_info):
             print("File is already ProRes in QuickTime container - checking if rewrap is still needed...")
-            # Even ProRes files might need color space updates
-            return True  # For now, always rewrap to ensure DCI-P3 color space
+            if has_target_color_tags(video_info):
+                print("ProRes file already carries DCI-P3 color tags - no rewrap needed")
+                return False
+            # Color tags still need updating; rewrap_to_prores does this with a stream copy
+            return True
         else:
             print("File is QuickTime/MOV but not ProRes - rewrapping needed")
             return True
@@ -91,37 +277,33 @@ def detect_interlacing(video_info):
     Detect if the video is interlaced and determine field order.
     Returns tuple: (is_interlaced, top_field_first)
     """
-    field_order = video_info.get('field_order', '').lower()
-    height = int(video_info.get('height', 0))
+    field_order = (video_info.get('field_order') or '').lower()
+    height = video_info.get('height') or 0
     
-    # Common interlaced indicators
-    interlaced_indicators = ['tt', 'bb', 'tb', 'bt']
-    is_interlaced = any(indicator in field_order for indicator in interlaced_indicators)
-    
-    # Height-based heuristics for common formats
-    if not is_interlaced:
+    if field_order in _KNOWN_FIELD_ORDERS:
+        # ffprobe reported the field order, so trust it (tt, bb, tb, bt or progressive)
+        is_interlaced = field_order != 'progressive'
+        top_field_first = field_order not in ('bb', 'bt')
+    else:
+        # Field order missing/unknown: fall back to height-based heuristics for common formats
         # PAL DV/HDV: 576 or 1080 lines often interlaced
         # NTSC DV: 480 lines often interlaced
-        if height in [480, 576, 1080]:
-            print(f"Height {height} suggests likely interlaced content")
-            is_interlaced = True
-    
-    # Determine field order
-    top_field_first = True  # Default for PAL
-    if 'bb' in field_order or 'bt' in field_order:
-        top_field_first = False
-    elif height == 480:  # NTSC is typically bottom field first
-        top_field_first = False
+        is_interlaced = height in (480, 576, 1080)
+        if is_interlaced:
+            print(f"Field order unknown; height {height} suggests likely interlaced content")
+        # NTSC is typically bottom field first, PAL top field first
+        top_field_first = height != 480
     
     print(f"Interlacing detection: interlaced={is_interlaced}, top_field_first={top_field_first}")
     return is_interlaced, top_field_first
 
-def rewrap_to_prores(source_file, output_directory):
+def rewrap_to_prores(source_file, output_directory, stop_event=None):
     """
     Converts a video file to ProRes 422 HQ in a QuickTime container using ffmpeg.
     Preserves interlaced field structure - NO deinterlacing is performed.
     This maintains the original interlaced format while converting to ProRes.
     Now includes DCI-P3 color space support and enhanced format detection.
+    If stop_event (a threading.Event) is set while ffmpeg runs, it is killed and None is returned.
     """
     if not os.path.exists(source_file):
         print(f"Error: Source file not found at {source_file}", file=sys.stderr)
@@ -141,6 +323,25 @@ def rewrap_to_prores(source_file, output_directory):
     base_name_no_ext = os.path.splitext(base_name)[0]
     output_file = os.path.join(output_directory, f"{base_name_no_ext}_prores.mov")
 
+    if is_prores_mov(source_file, video_info):
+        # Already ProRes: only the color tags differ, so copy the streams instead of re-encoding
+        command = [
+            'ffmpeg',
+            '-i', source_file,
+            '-map', '0',
+            '-c', 'copy',
+            '-color_primaries', '12',         # DCI-P3 primaries (numeric)
+            '-color_trc', '11',               # DCI-P3 transfer function (numeric)
+            '-colorspace', '12',              # DCI-P3 matrix (numeric)
+            '-color_range', 'tv',             # Limited range
+            '-movflags', '+faststart',
+            '-y',                            # Overwrite output file if it exists
+            output_file
+        ]
+        print(f"Retagging {source_file} to DCI-P3 (stream copy, no re-encode):")
+        print(f"  Output: {output_file}")
+        return _run_rewrap_command(command, output_file, "ProRes retag", stop_event)
+
     # Detect interlacing
     is_interlaced, top_field_first = detect_interlacing(video_info) if video_info else (True, True)
 
@@ -181,20 +382,46 @@ def rewrap_to_prores(source_file, output_directory):
     print(f"  Output: {output_file}")
     print("  Color space: DCI-P3")
     
+    # Show the full command for debugging
+    if video_info:
+        print(f"FFmpeg command: {' '.join(command)}")
+
+    return _run_rewrap_command(command, output_file, "ProRes encoding", stop_event)
+
+REWRAP_POLL_INTERVAL = 1  # Seconds between stop_event checks while ffmpeg runs
+
+def _run_rewrap_command(command, output_file, description, stop_event=None):
+    """
+    Run an ffmpeg rewrap command and verify the output file.
+    Returns the output path on success, None otherwise.
+    """
     try:
-        # Show the full command for debugging
-        if video_info:
-            print(f"FFmpeg command: {' '.join(command)}")
-        
-        # Using capture_output=True to hide ffmpeg's verbose output from the console
+        # Capture ffmpeg's verbose output to hide it from the console
         # and only show it if there's an error.
-        result = subprocess.run(command, check=True, capture_output=True, text=True, encoding='utf-8')
+        proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                                encoding='utf-8', creationflags=_CREATE_FLAGS)
+        while True:
+            try:
+                stdout, stderr = proc.communicate(timeout=REWRAP_POLL_INTERVAL)
+                break
+            except subprocess.TimeoutExpired:
+                if stop_event is not None and stop_event.is_set():
+                    proc.kill()
+                    proc.communicate()
+                    print(f"{description} interrupted; removing partial output", file=sys.stderr)
+                    try:
+                        os.remove(output_file)
+                    except OSError:
+                        pass
+                    return None
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, command, stdout, stderr)
         
         # Verify output file was created and has reasonable size
         if os.path.exists(output_file):
             output_size = os.path.getsize(output_file)
             if output_size > 1000000:  # At least 1MB
-                print(f"ProRes encoding completed successfully.")
+                print(f"{description} completed successfully.")
                 print(f"Output file size: {output_size / (1024*1024):.1f} MB")
                 return output_file
             else:
@@ -205,7 +432,7 @@ def rewrap_to_prores(source_file, output_directory):
             return None
             
     except subprocess.CalledProcessError as e:
-        print(f"Error during ProRes encoding: {e}", file=sys.stderr)
+        print(f"Error during {description}: {e}", file=sys.stderr)
         print(f"ffmpeg stderr:\n{e.stderr}", file=sys.stderr)
         
         # Provide helpful error messages for common issues
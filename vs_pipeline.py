@@ -13,6 +13,9 @@ BATCH_MODE = True  # ← CHANGE THIS: True = process directory, False = single f
 SUPPORTED_EXTENSIONS = ['.avi', '.mov', '.mp4', '.mkv', '.mpg', '.mpeg', '.ts', '.mts', '.m2ts', '.mxf', '.dv', '.hdv']
 SKIP_EXISTING = True  # Skip files that already have processed versions
 PROCESS_SUBDIRECTORIES = False  # Set to True to process subdirectories recursively
+PARALLEL_JOBS = 1  # Number of files processed concurrently (each runs its own vspipe | ffmpeg pipeline)
+RESERVED_CPU_CORES = 0  # Keep the pipeline off the first N cores (left to the OS / GPU driver); 0 = no pinning
+PROBE_CACHE_FILENAME = ".dvcvapourize_cache.json"  # Persisted ffprobe results, kept in the output directory
 
 # ============================================================================
 # SIMPLE TEST/FULL MODE CONTROL - ONLY CHANGE THESE TWO LINES
@@ -28,12 +31,18 @@ ENABLE_PERFORMANCE_PROFILING = True
 ENABLE_GPU_MONITORING = True
 ENABLE_DETAILED_TIMING = True
 PROCESS_DURATION = None  # Advanced: Set to seconds to limit processing time, or None for full file
+PROGRESS_REFRESH_PER_SECOND = 4  # Progress bar redraws and per-file progress updates per second
 
 # ============================================================================
 # VAPOURSYNTH OPTIONS
 # ============================================================================
 # The VapourSynth script will use FFmpegSource2 or automatically fallback to LSMASHSource if needed.
 # The `cache=False` parameter is used on the source filter to prevent indexing hangs when piping.
+DIRECT_SOURCE_LOADING = True  # Feed decodable sources straight to VapourSynth, skipping the intermediate ProRes rewrap
+# Intra-only codecs the source filters decode reliably from the original container. Long-GOP
+# formats (mpeg2video, h264, ...) still go through the rewrap: without an index their seeking is
+# unreliable, and their containers often lack nb_frames, so the frame count would be guessed.
+DIRECT_SOURCE_CODECS = frozenset(['dvvideo', 'prores', 'rawvideo', 'v210'])
 # ============================================================================
 
 # Import all required modules
@@ -42,39 +51,30 @@ import sys
 import subprocess
 import time
 import re
-from tqdm import tqdm
 import signal
+import shutil
 import threading
 import datetime
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, wait
 import multiprocessing
 import io
-import cProfile
-import pstats
+import importlib.util
 import queue
-from rewrap import rewrap_to_prores
-import glob
-
-# Add Rich library for better terminal UI
-try:
-    from rich.console import Console
-    from rich.panel import Panel
-    from rich.progress import Progress, TextColumn, BarColumn, TaskProgressColumn, TimeRemainingColumn, SpinnerColumn
-    from rich.table import Table
-    from rich.live import Live
-    from rich.layout import Layout
-    from rich import box
-    RICH_AVAILABLE = True
-except ImportError:
-    RICH_AVAILABLE = False
+import atexit
+from collections import namedtuple
+from functools import partial
+from contextlib import contextmanager
+from rewrap import rewrap_to_prores, probe, get_video_info, load_probe_cache
+
+# Add Rich library for better terminal UI. Only its presence is checked here; the
+# progress classes are imported where the batch progress bar is built.
+RICH_AVAILABLE = importlib.util.find_spec("rich") is not None
+if not RICH_AVAILABLE:
     print("Consider installing 'rich' for better terminal UI: pip install rich")
 
 # Add psutil for better process management (optional)
-try:
-    import psutil
-    PSUTIL_AVAILABLE = True
-except ImportError:
-    PSUTIL_AVAILABLE = False
+PSUTIL_AVAILABLE = importlib.util.find_spec("psutil") is not None
+if not PSUTIL_AVAILABLE:
     print("Consider installing 'psutil' for better process cleanup: pip install psutil")
 
 # ============================================================================
@@ -82,83 +82,216 @@ except ImportError:
 # ============================================================================
 class AppContext:
     def __init__(self):
-        self.process = None
-        self.process_manager = None
-        self.current_frame = 0
-        self.frame_count = 0
         self.pbar = None
-        self.cmd = None
         self.venv_env = None
+        self.tool_paths = {}  # Executable name -> absolute path, resolved once per run
+        self.cpu_affinity = None  # Cores the process is pinned to, or None when affinity is untouched
         self.has_nvidia_gpu = False
+        self.gpu_memory_query = None  # (time.monotonic() of the query, raw nvidia-smi memory.used,memory.total output)
         self.start_time = None
         self.profiler = None
         self.run_dir = None
+        self.debug_log_file = None
         self.log_file = None
-        self.input_file = None
         self.output_dir = None
-        self.output_file = None
-        self.vapoursynth_started = False
-        self.processing_task_created = False
-        self.last_frame_time = None
-        self.last_frame_count = 0
-        self.processing_start_time = None
         # Batch processing variables
         self.files_to_process = []
         self.current_file_index = 0
         self.total_files = 0
+        self.total_bytes = 0  # Combined input size; the overall progress bar advances by file size
         self.batch_start_time = None
         self.batch_progress = None
-        self.current_file_task = None
         self.overall_task = None
+        self.parallel_jobs = PARALLEL_JOBS
+        self.active_jobs = set()  # FileJobs currently running, so signal_handler can stop them all
+        self.jobs_lock = threading.RLock()  # Re-entrant: signal_handler may run while the main thread holds it
+        self.total_frames = 0
+        self.output_index = None  # Output directory listing (normcase'd name -> os.stat_result) used by should_skip_file
+
+class FileJob:
+    """Per-file processing state, kept off the shared context so files can run concurrently"""
+    def __init__(self, input_file, output_file, task_id=None):
+        self.source_file = input_file
+        self.input_file = input_file
+        self.output_file = output_file
+        self.task_id = task_id
+        self.frame_count = 0
+        self.current_frame = 0
+        self.vapoursynth_started = False
+        self.last_frame_time = None
+        self.last_frame_count = 0
+        self.cmd = None
+        self.process = None
+        self.process_manager = None
 
 context = AppContext()
-processing_times = {}
+processing_times = []  # (stage_name, perf_counter) marks; durations are derived when saving
+
+# Keep child processes from opening (and flashing) a console window on Windows
+_CREATE_FLAGS = subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
 
 # ============================================================================
 # BATCH PROCESSING FUNCTIONS
 # ============================================================================
 
+# Per-file details computed once at discovery, so later stages don't redo path/string work
+FileInfo = namedtuple('FileInfo', 'path name base_noext ext size mtime')
+
+def make_file_info(path, stat_result=None):
+    """Build a FileInfo for path, reusing stat_result when the caller already has one"""
+    if stat_result is None:
+        stat_result = os.stat(path)
+    name = os.path.basename(path)
+    base_noext, ext = os.path.splitext(name)
+    return FileInfo(path, name, base_noext, ext.lower(), stat_result.st_size, stat_result.st_mtime)
+
+# Lowercased name + multi-suffix endswith() checks the whole extension list in one C call
+_VIDEO_EXTS = tuple(ext.lower() for ext in SUPPORTED_EXTENSIONS)
+
 def find_video_files(directory_path):
     """Find all supported video files in the directory"""
     video_files = []
     
-    if PROCESS_SUBDIRECTORIES:
-        # Recursive search
-        for ext in SUPPORTED_EXTENSIONS:
-            pattern = os.path.join(directory_path, "**", f"*{ext}")
-            video_files.extend(glob.glob(pattern, recursive=True))
-    else:
-        # Search only in the specified directory
-        for ext in SUPPORTED_EXTENSIONS:
-            pattern = os.path.join(directory_path, f"*{ext}")
-            video_files.extend(glob.glob(pattern))
+    # Single scandir pass per folder, matching extensions with one endswith() and keeping
+    # each entry's stat result. Hidden files and folders are skipped, matching glob semantics.
+    pending_dirs = [directory_path]
+    while pending_dirs:
+        current_dir = pending_dirs.pop()
+        try:
+            entries = os.scandir(current_dir)
+        except OSError as e:
+            # An unreadable or vanished folder shouldn't abort the whole batch
+            log_message(f"WARNING: Skipping unreadable directory {current_dir}: {str(e)}")
+            continue
+        with entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith('.'):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        # Recursive search only when enabled; like os.walk, don't follow symlinked folders
+                        if PROCESS_SUBDIRECTORIES:
+                            pending_dirs.append(entry.path)
+                    elif name.lower().endswith(_VIDEO_EXTS) and entry.is_file():
+                        video_files.append(make_file_info(entry.path, entry.stat()))
+                except OSError as e:
+                    log_message(f"WARNING: Skipping unreadable entry {entry.path}: {str(e)}")
     
     # Sort files for consistent processing order
-    video_files.sort()
+    video_files.sort(key=lambda file_info: file_info.path)
     
     return video_files
 
-def get_output_filename(input_file, output_dir):
+def prefetch_probes(files):
+    """Probe all input files (FileInfo) concurrently so the batch loop hits the probe cache"""
+    if not files:
+        return
+    max_workers = min(8, os.cpu_count() or 1, len(files))
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {executor.submit(probe, file_info.path): file_info for file_info in files}
+        pending = set(futures)
+        while pending:
+            # Wake up periodically so a pending signal is handled promptly on this thread
+            done, pending = wait(pending, timeout=1.0)
+            for future in done:
+                file_info = futures[future]
+                try:
+                    if future.result() is None:
+                        log_message(f"WARNING: Could not probe {file_info.name}; it may be corrupt")
+                except Exception as e:
+                    log_message(f"WARNING: Error probing {file_info.name}: {str(e)}")
+            check_shutdown()
+    finally:
+        # On interrupt, don't start probes that are still queued
+        executor.shutdown(wait=True, cancel_futures=True)
+
+INPUT_PREFETCH_BYTES = 1 << 20  # Leading bytes of an upcoming input (container header/index) to pre-read
+
+def prefetch_input(path):
+    """Pull the start of an input file into the OS page cache; purely advisory, errors are ignored"""
+    try:
+        with open(path, 'rb', buffering=0) as f:
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(f.fileno(), 0, INPUT_PREFETCH_BYTES, os.POSIX_FADV_WILLNEED)
+            else:
+                f.read(INPUT_PREFETCH_BYTES)
+    except OSError:
+        pass
+
+def get_output_name(file_info):
+    """Output file name (no directory) for a given input file"""
+    return f"{file_info.base_noext}.mov"
+
+def get_output_filename(file_info, output_dir):
     """Generate the output filename for a given input file"""
-    base_name = os.path.splitext(os.path.basename(input_file))[0]
-    return os.path.join(output_dir, f"{base_name}.mov")
+    return os.path.join(output_dir, get_output_name(file_info))
 
-def should_skip_file(input_file, output_file):
+def index_output_directory(output_dir):
+    """Stat every file in the output directory in one scandir pass for should_skip_file"""
+    index = {}
+    try:
+        with os.scandir(output_dir) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    index[os.path.normcase(entry.name)] = entry.stat()
+    except OSError as e:
+        log_message(f"WARNING: Could not index output directory: {str(e)}")
+        return None
+    return index
+
+def refresh_output_index(file_info, output_file):
+    """Update the output index entry for a file that was just written"""
+    if context.output_index is None:
+        return
+    key = os.path.normcase(get_output_name(file_info))
+    try:
+        context.output_index[key] = os.stat(output_file)
+    except OSError:
+        context.output_index.pop(key, None)
+
+def should_skip_file(file_info, output_file):
     """Determine if we should skip processing this file"""
     if not SKIP_EXISTING:
         return False
     
-    if os.path.exists(output_file):
-        # Check if output file is newer than input file
-        input_time = os.path.getmtime(input_file)
-        output_time = os.path.getmtime(output_file)
-        
-        if output_time > input_time:
-            output_size = os.path.getsize(output_file)
-            if output_size > 1000000:  # At least 1MB
-                return True
+    if context.output_index is not None:
+        # Keyed by the name FileInfo already split out, so no basename() of the joined path;
+        # normcase matches names the way the filesystem does (case-insensitively on Windows)
+        output_stat = context.output_index.get(os.path.normcase(get_output_name(file_info)))
+    else:
+        try:
+            output_stat = os.stat(output_file)
+        except OSError:
+            output_stat = None
+    
+    # Skip if the output is at least 1MB and newer than the input file
+    if output_stat is None or output_stat.st_size <= 1000000:
+        return False
+    return output_stat.st_mtime > file_info.mtime
+
+OUTPUT_DIR_TIMEOUT = 10  # Seconds to wait for the output directory (often a network share) to respond
+
+def ensure_output_directory(path, timeout=OUTPUT_DIR_TIMEOUT):
+    """Create path if it doesn't exist, failing fast instead of hanging on an unresponsive share"""
+    outcome = []
+    
+    def attempt():
+        try:
+            os.makedirs(path, exist_ok=True)
+            outcome.append(None)
+        except Exception as e:
+            outcome.append(e)
     
-    return False
+    # A stalled SMB mount can block makedirs indefinitely, so run it where it can be abandoned
+    worker = threading.Thread(target=attempt, name="OutputDirCheck", daemon=True)
+    worker.start()
+    worker.join(timeout)
+    if not outcome:
+        raise TimeoutError(f"no response after {timeout} seconds")
+    if outcome[0] is not None:
+        raise outcome[0]
 
 def display_batch_summary():
     """Display a summary of files to be processed"""
@@ -171,13 +304,13 @@ def display_batch_summary():
         print(f"📂 OUTPUT DIRECTORY: {OUTPUT_DIRECTORY_PATH}")
         print(f"🔍 RECURSIVE SEARCH: {'Yes' if PROCESS_SUBDIRECTORIES else 'No'}")
         print(f"⏭️  SKIP EXISTING: {'Yes' if SKIP_EXISTING else 'No'}")
-        print(f"📊 TOTAL FILES FOUND: {len(context.files_to_process)}")
+        print(f"📊 TOTAL FILES FOUND: {len(context.files_to_process)} ({context.total_bytes / (1024 ** 3):.1f} GB)")
         
         if context.files_to_process:
             print(f"\n📝 FILES TO PROCESS:")
-            for i, file_path in enumerate(context.files_to_process[:10], 1):  # Show first 10
-                file_size = os.path.getsize(file_path) / (1024 * 1024)
-                print(f"   {i:2d}. {os.path.basename(file_path)} ({file_size:.1f} MB)")
+            # Sizes come from the stat taken during discovery; no per-file getsize here
+            for i, file_info in enumerate(context.files_to_process[:10], 1):  # Show first 10
+                print(f"   {i:2d}. {file_info.name} ({file_info.size / (1024 * 1024):.1f} MB)")
             
             if len(context.files_to_process) > 10:
                 print(f"   ... and {len(context.files_to_process) - 10} more files")
@@ -192,93 +325,95 @@ def display_batch_summary():
     
     print("="*80 + "\n")
 
-def process_single_file(input_file_path):
-    """Process a single file through the entire pipeline"""
+def process_single_file(file_info, task_id=None):
+    """Process a single file (FileInfo) through the entire pipeline"""
+    input_file_path = file_info.path
+    job = FileJob(input_file_path, get_output_filename(file_info, context.output_dir), task_id)
+    with context.jobs_lock:
+        context.active_jobs.add(job)
     try:
-        # Reset context for this file
-        context.input_file = input_file_path
-        context.output_file = get_output_filename(input_file_path, context.output_dir)
-        context.current_frame = 0
-        context.frame_count = 0
-        context.vapoursynth_started = False
-        context.processing_task_created = False
-        context.last_frame_time = None
-        context.last_frame_count = 0
-        context.processing_start_time = None
-        
-        log_message(f"Starting processing: {os.path.basename(input_file_path)}")
+        log_message(f"Starting processing: {file_info.name}")
         
         # Check if we should skip this file
-        if should_skip_file(input_file_path, context.output_file):
-            log_message(f"Skipping {os.path.basename(input_file_path)} - output already exists and is newer")
+        if should_skip_file(file_info, job.output_file):
+            log_message(f"Skipping {file_info.name} - output already exists and is newer")
             return True
         
-        # Step 1: Rewrap the source file
-        log_message(f"Rewrapping: {os.path.basename(input_file_path)}")
-        rewrapped_file = rewrap_to_prores(input_file_path, context.output_dir)
-        if not rewrapped_file:
-            log_message(f"Failed to rewrap: {os.path.basename(input_file_path)}")
-            return False
-        
-        context.input_file = rewrapped_file
+        # Step 1: Load the source directly when possible, otherwise rewrap it to ProRes first
+        if can_source_directly(input_file_path):
+            log_message(f"Loading source directly (no intermediate rewrap): {file_info.name}")
+        else:
+            log_message(f"Rewrapping: {file_info.name}")
+            rewrapped_file = rewrap_to_prores(input_file_path, context.output_dir, stop_event=_shutdown_event)
+            if not rewrapped_file:
+                log_message(f"Failed to rewrap: {file_info.name}")
+                return False
+            
+            job.input_file = rewrapped_file
         
         # Step 2: Get frame count for this file
-        context.frame_count = get_frame_count(context.input_file)
+        job.frame_count = get_frame_count(job.input_file)
         
         # Step 3: Build and execute VapourSynth command
-        if not build_and_execute_command():
-            log_message(f"Failed to process: {os.path.basename(input_file_path)}")
+        if not build_and_execute_command(job):
+            log_message(f"Failed to process: {file_info.name}")
             return False
         
+        refresh_output_index(file_info, job.output_file)
+        with context.jobs_lock:
+            context.total_frames += job.current_frame or job.frame_count
+        
         # Step 4: Verify output
-        if verify_output_quality():
-            log_message(f"Successfully processed: {os.path.basename(input_file_path)}")
-            if verify_color_space():
+        if verify_output_quality(job.output_file):
+            log_message(f"Successfully processed: {file_info.name}")
+            if verify_color_space(job.output_file):
                 log_message("Color space verification successful - DCI-P3 maintained.")
             return True
         else:
-            log_message(f"Output verification failed: {os.path.basename(input_file_path)}")
+            log_message(f"Output verification failed: {file_info.name}")
             return False
             
     except Exception as e:
-        log_message(f"Error processing {os.path.basename(input_file_path)}: {str(e)}")
+        log_message(f"Error processing {file_info.name}: {str(e)}")
         import traceback
         log_message(f"Traceback: {traceback.format_exc()}")
         return False
+    finally:
+        with context.jobs_lock:
+            context.active_jobs.discard(job)
+
+def can_source_directly(input_file):
+    """Check whether VapourSynth can load the file as-is, without an intermediate ProRes rewrap"""
+    if not DIRECT_SOURCE_LOADING:
+        return False
+    video_info = get_video_info(input_file)
+    if not video_info:
+        return False
+    if video_info.get('codec_name', '').lower() not in DIRECT_SOURCE_CODECS:
+        return False
+    # vspipe's -e comes from the frame count, which must be exact rather than estimated
+    return str(video_info.get('nb_frames', '')).isdigit()
 
 def get_frame_count(input_file):
     """Get frame count for a specific file"""
     try:
+        # probe() is memoized, so this reuses the result from rewrapping when the file is unchanged
+        probe_data = probe(input_file)
+        if not probe_data:
+            raise RuntimeError("ffprobe returned no data")
+
+        stream = (probe_data.get('streams') or [{}])[0]
+        nb_frames = str(stream.get('nb_frames', ''))
+
         # Try reading the container's nb_frames header
-        probe_cmd = (
-            f'ffprobe -v error -select_streams v:0 '
-            f'-show_entries stream=nb_frames '
-            f'-of default=noprint_wrappers=1:nokey=1 "{input_file}"'
-        )
-        result = subprocess.run(probe_cmd, capture_output=True, text=True, shell=True, timeout=10)
-        stdout = result.stdout.strip()
-        
-        if result.returncode == 0 and stdout.isdigit():
-            frame_count = int(stdout)
+        if nb_frames.isdigit():
+            frame_count = int(nb_frames)
             log_message(f"Frame count detected via metadata: {frame_count}")
             return frame_count
         else:
             # Fallback: compute from duration × framerate
-            duration_cmd = (
-                f'ffprobe -v error '
-                f'-show_entries format=duration '
-                f'-of default=noprint_wrappers=1:nokey=1 "{input_file}"'
-            )
-            dur_res = subprocess.run(duration_cmd, capture_output=True, text=True, shell=True, timeout=10)
-            duration = float(dur_res.stdout.strip())
-
-            fr_cmd = (
-                f'ffprobe -v error -select_streams v:0 '
-                f'-show_entries stream=r_frame_rate '
-                f'-of default=noprint_wrappers=1:nokey=1 "{input_file}"'
-            )
-            fr_res = subprocess.run(fr_cmd, capture_output=True, text=True, shell=True, timeout=10)
-            fr_str = fr_res.stdout.strip()
+            duration = float(probe_data['format']['duration'])
+            fr_str = stream.get('r_frame_rate', '')
             
             if '/' in fr_str:
                 num, den = map(int, fr_str.split('/'))
@@ -297,72 +432,80 @@ def get_frame_count(input_file):
         log_message(f"Could not determine frame count; using fallback estimation of {estimated} frames due to: {e}")
         return estimated
 
-def build_and_execute_command():
-    """Build and execute the VapourSynth processing command"""
+def format_command(args):
+    """Render an argv list as a single command line for logging"""
+    return ' '.join(f'"{arg}"' if ' ' in str(arg) else str(arg) for arg in args)
+
+def build_and_execute_command(job):
+    """Build and execute the VapourSynth processing command for one file"""
     try:
         # Build VapourSynth command
         script_path = "upscale.vpy"
         
         vspipe_args = [
-            'vspipe',
-            '-a', f'input_file={context.input_file}',
+            context.tool_paths.get('vspipe', 'vspipe'),
+            '-a', f'input_file={job.input_file}',
             script_path
         ]
 
         # Add frame range arguments
         if TEST_MODE:
             vspipe_args.extend(['-s', '0', '-e', str(TEST_FRAME_COUNT - 1)])
-        elif context.frame_count and context.frame_count > 0:
-            vspipe_args.extend(['-s', '0', '-e', str(context.frame_count - 1)])
+        elif job.frame_count and job.frame_count > 0:
+            vspipe_args.extend(['-s', '0', '-e', str(job.frame_count - 1)])
 
+        # Y4M carries frame size, rate and pixel format in its header, so ffmpeg no longer
+        # needs them repeated (and hardcoded) on its command line
+        vspipe_args.extend(['--container', 'y4m'])
         vspipe_args.append('-')  # Pipe to stdout
 
-        vspipe_cmd = ' '.join(f'"{arg}"' if ' ' in str(arg) else str(arg) for arg in vspipe_args)
-
-        # Build FFmpeg command
-        expected_width = 3840
-        expected_height = 2160
-        raw_fps = "25/1"
-        
-        ffmpeg_cmd = (
-            f'ffmpeg -f rawvideo -pix_fmt yuv422p10le -s {expected_width}x{expected_height} -r {raw_fps} -i - '
-            f'-c:v prores_ks -profile:v 3 -pix_fmt yuv422p10le '
-            f'-color_range tv -color_primaries 12 -color_trc 11 -colorspace 12 '
-            f'-video_track_timescale 25 -y "{context.output_file}"'
-        )
+        # Build FFmpeg command. Y4M has no fields for primaries/transfer/matrix,
+        # so the DCI-P3 tags set in upscale.vpy are restated for the ProRes stream.
+        ffmpeg_args = [
+            context.tool_paths.get('ffmpeg', 'ffmpeg'), '-f', 'yuv4mpegpipe', '-i', '-',
+            '-c:v', 'prores_ks', '-profile:v', '3', '-pix_fmt', 'yuv422p10le',
+            '-color_range', 'tv', '-color_primaries', '12', '-color_trc', '11', '-colorspace', '12',
+            '-video_track_timescale', '25', '-y', job.output_file
+        ]
 
-        context.cmd = f"{vspipe_cmd} | {ffmpeg_cmd}"
+        pipeline = [vspipe_args, ffmpeg_args]
+        job.cmd = ' | '.join(format_command(args) for args in pipeline)
         
-        log_message(f"Processing command: {context.cmd}")
+        log_message(f"Processing command: {job.cmd}")
         
         # Execute the command
-        context.process_manager = ProcessManager(context.cmd, env=context.venv_env, timeout=30)
-        context.process = context.process_manager.start()
+        job.process_manager = ProcessManager(pipeline, env=context.venv_env, timeout=30)
+        job.process = job.process_manager.start()
 
-        if not context.process:
+        if not job.process:
             log_message("Failed to start processing")
             return False
 
         # Start monitoring
-        progress_thread = threading.Thread(target=monitor_progress, name="ProgressMonitor")
+        progress_thread = threading.Thread(target=monitor_progress, args=(job,), name="ProgressMonitor")
         progress_thread.daemon = True
+        job.process_manager.progress_thread = progress_thread
         progress_thread.start()
 
         # Wait for completion
         try:
-            while context.process.poll() is None:
+            while job.process.poll() is None:
                 try:
-                    context.process.wait(timeout=1.0)
+                    job.process.wait(timeout=1.0)
                 except subprocess.TimeoutExpired:
+                    if _shutdown_event.is_set():
+                        check_shutdown()
+                        # Worker threads just abandon their pipeline; the main thread cleans up
+                        break
                     continue
                 except KeyboardInterrupt:
                     log_message("Keyboard interrupt detected", force_console=True)
-                    context.process_manager.stop()
+                    job.process_manager.stop()
                     raise
         finally:
-            context.process_manager.stop()
+            job.process_manager.stop()
 
-        return context.process.returncode == 0
+        return job.process.returncode == 0
         
     except Exception as e:
         log_message(f"Error in build_and_execute_command: {str(e)}")
@@ -375,42 +518,147 @@ def build_and_execute_command():
 def record_timing(stage_name):
     """Record time taken for a specific processing stage"""
     if ENABLE_DETAILED_TIMING:
-        now = time.time()
-        if 'last_time' in processing_times:
-            elapsed = now - processing_times['last_time']
-            processing_times[stage_name] = elapsed
-            print(f"Time for {stage_name}: {elapsed:.2f} seconds")
-        processing_times['last_time'] = now
-
-def log_message(message, print_to_console=True, force_console=False):
-    """Log message to file and optionally to console"""
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    full_message = f"[{timestamp}] {message}"
+        now = time.perf_counter()
+        if processing_times:
+            print(f"Time for {stage_name}: {now - processing_times[-1][1]:.2f} seconds")
+        processing_times.append((stage_name, now))
+
+# Log lines are queued as (path, text) and written by one background thread that keeps
+# the file open, so logging never pays an open/write/flush/close per line
+LOG_BATCH_SIZE = 256       # Flush after this many queued lines...
+LOG_FLUSH_INTERVAL = 0.5   # ...or this many seconds after the first unflushed line
+_log_queue = queue.Queue()
+_log_writer = None
+_log_writer_lock = threading.Lock()
+
+def _report_log_error(e):
+    if not hasattr(context, '_log_error_shown'):
+        print(f"!!! LOGGING ERROR: {str(e)}")
+        context._log_error_shown = True
+
+def _log_writer_loop():
+    """Drain the log queue into persistent file handles, one flush per batch"""
+    handles = {}
+    while True:
+        path, text = _log_queue.get()
+        deadline = time.monotonic() + LOG_FLUSH_INTERVAL
+        pending = 0
+        waiters = []
+        while True:
+            if path is None:
+                # Flush request from flush_logs(); text is its Event
+                waiters.append(text)
+                break
+            try:
+                handle = handles.get(path)
+                if handle is None:
+                    handle = handles[path] = open(path, 'a', encoding='utf-8', buffering=64 * 1024)
+                handle.write(text)
+            except Exception as e:
+                _report_log_error(e)
+            pending += 1
+            remaining = deadline - time.monotonic()
+            if pending >= LOG_BATCH_SIZE or remaining <= 0:
+                break
+            try:
+                path, text = _log_queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+        for handle in handles.values():
+            try:
+                handle.flush()
+            except Exception as e:
+                _report_log_error(e)
+        for waiter in waiters:
+            waiter.set()
+
+def _log_writer_alive():
+    global _log_writer
+    if _log_writer is None:
+        with _log_writer_lock:
+            if _log_writer is None:
+                _log_writer = threading.Thread(target=_log_writer_loop, name="LogWriter", daemon=True)
+                _log_writer.start()
+    return _log_writer.is_alive()
+
+def write_log_line(path, text):
+    """Queue text for appending to path, writing synchronously if the writer thread died"""
+    if _log_writer_alive():
+        _log_queue.put((path, text))
+        return
+    try:
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(text)
+    except Exception as e:
+        _report_log_error(e)
+
+def flush_logs(timeout=5.0):
+    """Block until every log line queued so far has been written and flushed"""
+    if _log_writer is None or not _log_writer.is_alive():
+        return
+    done = threading.Event()
+    _log_queue.put((None, done))
+    done.wait(timeout)
+
+atexit.register(flush_logs)
+
+# [second, formatted] - consecutive log lines almost always fall in the same second
+_ts_cache = [0, ""]
+
+def _now_ts():
+    """Return the current local time as 'YYYY-mm-dd HH:MM:SS', formatting at most once per second"""
+    now = int(time.time())
+    cache = _ts_cache
+    if now != cache[0]:
+        cache[1] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+        cache[0] = now
+    return cache[1]
+
+def log_message(message, *args, print_to_console=True, force_console=False):
+    """Log message to file and optionally to console; %-style args are only formatted if emitted"""
+    to_console = print_to_console and (force_console or context.pbar is None)
+    if not context.log_file and not to_console:
+        return
+    if args:
+        message = message % args
+    
+    # Formatted once, newline included, and shared by the file and console writes
+    line = f"[{_now_ts()}] {message}\n"
     
     # Log to file if available
     if context.log_file:
-        try:
-            with open(context.log_file, 'a', encoding='utf-8') as f:
-                f.write(full_message + "\n")
-                f.flush()
-        except Exception as e:
-            if not hasattr(context, '_log_error_shown'):
-                print(f"!!! LOGGING ERROR: {str(e)}")
-                context._log_error_shown = True
+        write_log_line(context.log_file, line)
     
     # Console output
-    if print_to_console:
-        if force_console or context.pbar is None:
-            print(full_message)
+    if to_console:
+        print(line, end='')
 
-def debug_log(message):
+def debug_log(message, *args):
     """Log message only when in debug mode"""
     if DEBUG_MODE:
+        if args:
+            message = message % args
         log_message(f"[DEBUG] {message}")
         
-        debug_file = os.path.join(context.run_dir, "debug_log.txt")
-        with open(debug_file, 'a') as f:
-            f.write(f"[{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {message}\n")
+        # Appended through the log writer's persistent handle; no open/close per line
+        if context.debug_log_file:
+            write_log_line(context.debug_log_file, f"[{_now_ts()}] {message}\n")
+
+PROFILE_FILE_LIMIT = 3  # Only the first N files run under cProfile; the rest skip its per-call hook
+
+@contextmanager
+def profiled_file(index):
+    """Profile one file's processing if it's among the first PROFILE_FILE_LIMIT files"""
+    profiler = context.profiler
+    # cProfile only follows the thread that enabled it, so --parallel workers are never profiled
+    if profiler is None or index >= PROFILE_FILE_LIMIT or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
 
 def save_performance_profile():
     """Save the performance profile data to a file"""
@@ -422,35 +670,29 @@ def save_performance_profile():
         context.profiler.disable()
         
         profile_path = os.path.join(context.run_dir, "performance_profile.txt")
+        stats_path = os.path.join(context.run_dir, "performance_profile.prof")
         log_message(f"Saving performance profile to {profile_path}")
         
-        s = io.StringIO()
-        
-        try:
-            import pstats
-            ps = pstats.Stats(context.profiler, stream=s).sort_stats('cumulative')
-            ps.print_stats(50)
-        except ImportError:
-            log_message("Error: pstats module not available, using basic profiling output")
-            s.write("pstats module not available for detailed profiling output\n")
-            s.write(str(context.profiler))
+        # Raw binary stats: no Stats build/sort/format on the shutdown path.
+        # Inspect offline with pstats or snakeviz.
+        context.profiler.dump_stats(stats_path)
         
         with open(profile_path, 'w') as f:
             f.write("VapourSynth Processing Pipeline Performance Profile\n")
             f.write("=================================================\n\n")
-            f.write(s.getvalue())
+            f.write(f"Call statistics: {stats_path}\n")
+            f.write(f"  View with: python -m pstats \"{stats_path}\"  (or snakeviz)\n")
             
-            if processing_times and len(processing_times) > 1:
+            if len(processing_times) > 1:
                 f.write("\n\nStage Timing Information:\n")
                 f.write("========================\n\n")
-                for stage, duration in processing_times.items():
-                    if stage != 'last_time':
-                        f.write(f"{stage}: {duration:.2f} seconds\n")
+                for (_, previous), (stage, now) in zip(processing_times, processing_times[1:]):
+                    f.write(f"{stage}: {now - previous:.2f} seconds\n")
                         
-            total_time = time.time() - context.start_time
+            total_time = time.perf_counter() - context.start_time
             f.write(f"\nTotal processing time: {total_time:.2f} seconds ({total_time/60:.2f} minutes)\n")
-            if total_time > 0 and context.frame_count and context.frame_count > 0:
-                f.write(f"Average processing speed: {context.frame_count/total_time:.2f} frames per second\n")
+            if total_time > 0 and context.total_frames > 0:
+                f.write(f"Average processing speed: {context.total_frames/total_time:.2f} frames per second\n")
             
         log_message(f"Performance profile saved to {profile_path}")
         return True
@@ -460,37 +702,40 @@ def save_performance_profile():
         log_message(f"Traceback: {traceback.format_exc()}")
         return False
 
+# The installed signal handler only records the request; the cleanup below runs later on the
+# main thread, so it never re-enters a lock or queue the interrupted code was holding. Every
+# long wait on the main thread (encode, rewrap, probing, startup) polls for it.
+_shutdown_event = threading.Event()
+_shutdown_signal = None
+
+def request_shutdown(sig, frame):
+    """Signal handler: flag a shutdown for the main thread; a second signal aborts immediately"""
+    global _shutdown_signal
+    if _shutdown_event.is_set():
+        raise KeyboardInterrupt
+    _shutdown_signal = sig
+    _shutdown_event.set()
+
+def check_shutdown():
+    """Run the deferred shutdown if a signal has arrived (main thread only)"""
+    if _shutdown_event.is_set() and threading.current_thread() is threading.main_thread():
+        signal_handler(_shutdown_signal, None)
+
 def signal_handler(sig, frame):
     """Handle interrupt signals gracefully with improved cleanup"""
     log_message(f"Received signal {sig}, shutting down gracefully...", force_console=True)
     
-    # Stop all monitoring threads first
-    if hasattr(context, 'process_manager') and context.process_manager:
-        try:
-            context.process_manager.stop()
-        except Exception as e:
-            log_message(f"Error stopping process manager: {str(e)}", force_console=True)
-    
-    # Gracefully terminate the main process
-    if context.process is not None:
-        try:
-            log_message("Terminating VapourSynth/FFmpeg processes...", force_console=True)
-            context.process.terminate()
-            
+    # Stop every running vspipe/ffmpeg pipeline
+    with context.jobs_lock:
+        running_jobs = list(context.active_jobs)
+    if running_jobs:
+        log_message("Terminating VapourSynth/FFmpeg processes...", force_console=True)
+    for job in running_jobs:
+        if job.process_manager:
             try:
-                context.process.wait(timeout=15)
-                log_message("Process terminated gracefully", force_console=True)
-            except subprocess.TimeoutExpired:
-                log_message("Process not responding after 15 seconds, forcing kill...", force_console=True)
-                context.process.kill()
-                
-                try:
-                    context.process.wait(timeout=5)
-                except subprocess.TimeoutExpired:
-                    log_message("Process forcefully terminated", force_console=True)
-                
-        except Exception as e:
-            log_message(f"Error terminating process: {str(e)}", force_console=True)
+                job.process_manager.stop()
+            except Exception as e:
+                log_message(f"Error stopping process manager: {str(e)}", force_console=True)
     
     # Clean up progress bar
     if hasattr(context, 'pbar') and context.pbar:
@@ -517,100 +762,138 @@ def signal_handler(sig, frame):
         log_message(f"Error saving profile on exit: {str(e)}", force_console=True)
     
     log_message("Cleanup complete. Exiting...", force_console=True)
+    flush_logs()
     sys.exit(0)
 
-def monitor_progress():
-    """Monitor processing progress and update progress bar"""
-    import time
-    import re
-    
-    context.current_frame = 0
+STDERR_READ_SIZE = 65536  # Bytes per os.read() of the pipeline's stderr in monitor_progress
+
+# ffmpeg's "frame=" status, vspipe's "Output N frames" summary, or "N frames in", in one pass
+# (case-sensitive: both tools print these literals exactly)
+_FRAME_RE = re.compile(r'frame=\s*(?P<ffmpeg>\d+)|Output (?P<output>\d+) frames|(?P<done>\d+) frames in')
+# Markers the VapourSynth script prints once its source filter has loaded
+_VS_START_RE = re.compile(r'\[FORMAT\]|\[SOURCE\]|FFmpegSource2 loaded successfully|LSMASHSource loaded successfully')
+
+def _max_frame(text):
+    """Return the highest frame count reported anywhere in a block of stderr text, or 0"""
+    # The regex engine scans the whole block in C; Python only sees the matches
+    latest = 0
+    for match in _FRAME_RE.finditer(text):
+        frame = int(match.group('ffmpeg') or match.group('output') or match.group('done'))
+        if frame > latest:
+            latest = frame
+    return latest
+
+def monitor_progress(job):
+    """Monitor processing progress of one file and update its progress bar"""
+    job.current_frame = 0
     
     try:
-        if context.process is None:
+        if job.process is None:
             log_message("No process to monitor", force_console=True)
             return
+        
+        # Progress is shown per file in Rich batch mode; otherwise stderr is still
+        # drained so a full pipe can never stall vspipe or ffmpeg
+        show_progress = RICH_AVAILABLE and BATCH_MODE and job.task_id is not None
+        refresh_interval = 1.0 / PROGRESS_REFRESH_PER_SECOND
+        last_publish = 0.0
+        
+        def publish(current_time):
+            current_frame = job.current_frame
             
-        if RICH_AVAILABLE and BATCH_MODE:
-            # In batch mode, update the current file progress
-            if context.current_file_task is not None:
-                for line in iter(context.process.stderr.readline, ''):
-                    current_time = time.time()
-                    if not line:
-                        break
-                        
+            # Calculate speed over the frames seen since the previous update
+            if job.last_frame_time is not None:
+                time_diff = current_time - job.last_frame_time
+                frame_diff = current_frame - job.last_frame_count
+                if time_diff > 0 and frame_diff > 0:
+                    fps = frame_diff / time_diff
+                    speed_text = f"{fps:.1f} fps"
+                else:
+                    speed_text = "calculating..."
+            else:
+                speed_text = "starting..."
+            
+            job.last_frame_time = current_time
+            job.last_frame_count = current_frame
+            
+            # Update progress
+            if TEST_MODE:
+                completed = min(current_frame, TEST_FRAME_COUNT)
+                total = TEST_FRAME_COUNT
+            else:
+                completed = current_frame
+                total = job.frame_count if job.frame_count else current_frame + 1000
+            
+            context.batch_progress.update(
+                job.task_id,
+                completed=completed,
+                total=total,
+                speed=speed_text
+            )
+        
+        # Read stderr in large chunks and split lines ourselves: one syscall per burst
+        # of output instead of one per line. ffmpeg ends status lines with \r, so both
+        # \r and \n terminate a line.
+        stderr = job.process_manager.stderr
+        remainder = b''
+        
+        # Hot-loop state lives in locals and is written back to the job once per chunk
+        debug = DEBUG_MODE
+        vs_start_search = _VS_START_RE.search
+        vapoursynth_started = job.vapoursynth_started
+        latest_frame = job.current_frame
+        while True:
+            chunk = stderr.read(STDERR_READ_SIZE)
+            if chunk:
+                data = remainder + chunk
+                cut = max(data.rfind(b'\n'), data.rfind(b'\r'))
+                if cut < 0:
+                    remainder = data
+                    continue
+                remainder = data[cut + 1:]
+                text = data[:cut]
+            else:
+                # EOF: every stage has exited; flush the unterminated tail
+                text = remainder
+                remainder = b''
+            
+            current_time = time.perf_counter()
+            # Each chunk holds only complete lines, so it is scanned as one block rather than
+            # split and matched line by line
+            text = text.decode('utf-8', 'replace')
+            
+            if debug:
+                for line in text.replace('\r', '\n').split('\n'):
                     line = line.strip()
-                    if not line:
-                        continue
-                    
-                    if DEBUG_MODE and line:
-                        debug_log(f"STDERR: {line}")
-                    
-                    if context.process.poll() is not None:
-                        break
-                    
-                    # Detect VapourSynth processing start
-                    if not context.vapoursynth_started and (
-                        "[FORMAT]" in line or 
-                        "[SOURCE]" in line or
-                        "FFmpegSource2 loaded successfully" in line or
-                        "LSMASHSource loaded successfully" in line
-                    ):
-                        context.vapoursynth_started = True
-                        if DEBUG_MODE:
-                            debug_log(f"VapourSynth detected from line: {line}")
-                    
-                    # Update frame progress
-                    frame_patterns = [
-                        r'frame=\s*(\d+)',
-                        r'Output (\d+) frames',
-                        r'(\d+) frames in',
-                    ]
-                    
-                    for pattern in frame_patterns:
-                        try:
-                            frame_match = re.search(pattern, line, re.IGNORECASE)
-                            if frame_match:
-                                current_frame = int(frame_match.group(1))
-                                if current_frame > context.current_frame:
-                                    context.current_frame = current_frame
-                                    
-                                    # Calculate speed
-                                    if context.last_frame_time is not None:
-                                        time_diff = current_time - context.last_frame_time
-                                        frame_diff = current_frame - context.last_frame_count
-                                        if time_diff > 0 and frame_diff > 0:
-                                            fps = frame_diff / time_diff
-                                            speed_text = f"{fps:.1f} fps"
-                                        else:
-                                            speed_text = "calculating..."
-                                    else:
-                                        speed_text = "starting..."
-                                    
-                                    context.last_frame_time = current_time
-                                    context.last_frame_count = current_frame
-                                    
-                                    # Update progress
-                                    if TEST_MODE:
-                                        completed = min(current_frame, TEST_FRAME_COUNT)
-                                        total = TEST_FRAME_COUNT
-                                    else:
-                                        completed = current_frame
-                                        total = context.frame_count if context.frame_count else current_frame + 1000
-                                    
-                                    context.batch_progress.update(
-                                        context.current_file_task,
-                                        completed=completed,
-                                        total=total,
-                                        speed=speed_text
-                                    )
-                                break
-                        except (ValueError, AttributeError):
-                            continue
-        else:
-            # Fallback or single file mode - use existing progress monitoring
-            # ... (existing non-batch progress monitoring code)
-            pass
+                    if line:
+                        debug_log("STDERR: %s", line)
+            
+            # Detect VapourSynth processing start
+            if not vapoursynth_started:
+                start_match = vs_start_search(text)
+                if start_match:
+                    vapoursynth_started = job.vapoursynth_started = True
+                    if debug:
+                        debug_log("VapourSynth detected from marker: %s", start_match.group(0))
+            
+            # Update frame progress
+            current_frame = _max_frame(text)
+            if current_frame > latest_frame:
+                latest_frame = current_frame
+            
+            job.current_frame = latest_frame
+            
+            # Coalesce: only the latest frame count since the last tick is published
+            if show_progress and job.current_frame > job.last_frame_count and current_time - last_publish >= refresh_interval:
+                publish(current_time)
+                last_publish = current_time
+            
+            if not chunk:
+                break
+        
+        # Publish whatever arrived after the last tick
+        if show_progress and job.current_frame > job.last_frame_count:
+            publish(time.perf_counter())
             
     except Exception as e:
         log_message(f"Error in progress monitoring: {str(e)}", force_console=True)
@@ -639,23 +922,61 @@ def setup_venv_environment():
     
     return env
 
-def verify_output_quality():
+def apply_cpu_affinity(reserved_cores):
+    """Restrict this process (and the children it starts) to all but the first reserved_cores cores"""
+    if reserved_cores <= 0:
+        return None
+    try:
+        if hasattr(os, 'sched_setaffinity'):
+            cores = sorted(os.sched_getaffinity(0))[reserved_cores:]
+            if not cores:
+                log_message(f"WARNING: Cannot reserve {reserved_cores} cores; leaving CPU affinity unchanged")
+                return None
+            os.sched_setaffinity(0, cores)
+        elif sys.platform == 'win32':
+            import ctypes
+            cores = list(range(reserved_cores, min(os.cpu_count() or 1, 64)))
+            if not cores:
+                log_message(f"WARNING: Cannot reserve {reserved_cores} cores; leaving CPU affinity unchanged")
+                return None
+            mask = sum(1 << core for core in cores)
+            kernel32 = ctypes.windll.kernel32
+            if not kernel32.SetProcessAffinityMask(kernel32.GetCurrentProcess(), ctypes.c_size_t(mask)):
+                raise ctypes.WinError()
+        else:
+            log_message("WARNING: CPU affinity is not supported on this platform")
+            return None
+    except Exception as e:
+        log_message(f"WARNING: Could not set CPU affinity: {str(e)}")
+        return None
+    
+    log_message(f"CPU affinity: cores {cores[0]}-{cores[-1]} ({len(cores)} cores, first {reserved_cores} reserved)")
+    return cores
+
+def resolve_tool_paths(env):
+    """Resolve vspipe and ffmpeg once, against the PATH the pipeline runs with"""
+    search_path = env.get("PATH") if env else None
+    # Fall back to the bare name so a missing tool still fails with the usual Popen error
+    return {tool: shutil.which(tool, path=search_path) or tool for tool in ('vspipe', 'ffmpeg')}
+
+def verify_output_quality(output_file):
     """Verify the output file integrity and quality"""
-    if not os.path.exists(context.output_file):
+    try:
+        file_size = os.stat(output_file).st_size
+    except OSError:
         log_message("Output verification: File does not exist")
         return False
         
-    file_size = os.path.getsize(context.output_file)
     if file_size < 1000000:  # Less than 1MB
         log_message(f"Output verification: File too small ({file_size} bytes)")
         return False
         
     try:
-        probe_cmd = f'ffprobe -v error -show_entries format=duration -of default=noprint_wrappers=1:nokey=1 "{context.output_file}"'
-        result = subprocess.run(probe_cmd, shell=True, capture_output=True, text=True)
+        # Same memoized probe verify_color_space uses, so verification costs one ffprobe
+        probe_data = probe(output_file)
         
-        if result.returncode == 0 and result.stdout.strip():
-            duration_str = result.stdout.strip()
+        if probe_data:
+            duration_str = str(probe_data.get('format', {}).get('duration', '')).strip()
             if duration_str.lower() in ['n/a', 'na', '']:
                 log_message("Output verification: Duration unavailable but file exists and has good size")
                 return True
@@ -667,82 +988,125 @@ def verify_output_quality():
                 log_message(f"Output verification: Could not parse duration '{duration_str}' but file appears valid")
                 return True
         else:
-            log_message(f"Output verification: ffprobe failed with return code {result.returncode}")
+            log_message("Output verification: ffprobe could not read the output file")
             return False
     except Exception as e:
         log_message(f"Output verification error: {str(e)}")
         return False
 
-def verify_color_space():
+# Accepted ffprobe names (or raw numbers) for the -color_primaries 12 -color_trc 11 -colorspace 12
+# tags the encode writes
+EXPECTED_COLOR_TAGS = (
+    ('color_primaries', frozenset({'smpte432', '12'})),
+    ('color_transfer', frozenset({'iec61966-2-4', '11'})),
+    ('color_space', frozenset({'chroma-derived-nc', '12'})),
+)
+
+def _color_tag_matches(value, expected):
+    # EXPECTED_COLOR_TAGS holds the exact names (and numeric values) ffprobe reports
+    return value.lower() in expected
+
+def verify_color_space(output_file):
     """Verify the output file has correct DCI-P3 color space"""
-    if not os.path.exists(context.output_file):
-        log_message("Color space verification: File does not exist")
-        return False
-        
     try:
-        probe_cmd = (
-            f'ffprobe -v error -select_streams v:0 '
-            f'-show_entries stream=color_primaries,color_trc,colorspace,color_range '
-            f'-of default=noprint_wrappers=1 "{context.output_file}"'
-        )
-        result = subprocess.run(probe_cmd, shell=True, capture_output=True, text=True)
+        # Reuses the probe result cached by verify_output_quality for this path/size/mtime;
+        # probe() stats the file itself and returns None if it is missing
+        probe_data = probe(output_file)
         
-        if result.returncode == 0:
-            output_lines = result.stdout.strip().split('\n')
-            color_info = {}
-            for line in output_lines:
-                if '=' in line:
-                    key, value = line.split('=', 1)
-                    color_info[key] = value
+        if probe_data:
+            stream = (probe_data.get('streams') or [{}])[0]
+            color_info = {key: stream.get(key, '') for key in ('color_primaries', 'color_transfer', 'color_space', 'color_range')}
             
             log_message(f"Color space verification: {color_info}")
             
-            expected_primaries = ['smpte432', '12']
-            expected_trc = ['smpte428', '11']
-            expected_colorspace = ['smpte432', '12']
-            
-            primaries_ok = any(exp in color_info.get('color_primaries', '').lower() for exp in expected_primaries)
-            trc_ok = any(exp in color_info.get('color_trc', '').lower() for exp in expected_trc)
-            colorspace_ok = any(exp in color_info.get('colorspace', '').lower() for exp in expected_colorspace)
-            
-            if primaries_ok and trc_ok and colorspace_ok:
+            if all(_color_tag_matches(color_info[key], expected) for key, expected in EXPECTED_COLOR_TAGS):
                 log_message("✅ Color space verification: Proper DCI-P3 color space detected")
                 return True
             else:
                 log_message("⚠️  Color space verification: May not have correct DCI-P3 color space")
                 return False
         else:
-            log_message(f"Color space verification: ffprobe failed with return code {result.returncode}")
+            log_message("Color space verification: ffprobe could not read the output file")
             return False
     except Exception as e:
         log_message(f"Color space verification error: {str(e)}")
         return False
 
-def detect_nvidia_gpu():
-    """Detect if NVIDIA GPU is available for monitoring"""
+# One nvidia-smi query answers both "is there an NVIDIA GPU" and "how much memory is in use"
+GPU_QUERY_CMD = ['nvidia-smi', '--query-gpu=memory.used,memory.total', '--format=csv,noheader,nounits']
+
+def start_gpu_query():
+    """Launch the nvidia-smi query in the background so it overlaps the rest of startup"""
     try:
-        result = subprocess.run('nvidia-smi', capture_output=True, text=True, shell=True)
-        return result.returncode == 0
-    except:
-        return False
+        return subprocess.Popen(
+            GPU_QUERY_CMD,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            creationflags=_CREATE_FLAGS
+        )
+    except OSError:
+        return None
+
+GPU_QUERY_TTL = 5  # Seconds a memory reading is reused before nvidia-smi is run again
+
+def _reap_gpu_query(gpu_query):
+    """Collect the output of a start_gpu_query() process, or None if it failed"""
+    if gpu_query is None:
+        return None
+    try:
+        stdout, _ = gpu_query.communicate(timeout=10)
+    except subprocess.TimeoutExpired:
+        gpu_query.kill()
+        gpu_query.communicate()
+        return None
+    if gpu_query.returncode != 0:
+        return None
+    return stdout
+
+_GPU_NOT_QUERIED = object()  # detect_nvidia_gpu() default: no query was started for it
+_nvidia_gpu_detected = None   # Cached detect_nvidia_gpu() answer, negative included; None until known
+
+def detect_nvidia_gpu(gpu_query=_GPU_NOT_QUERIED):
+    """Detect if NVIDIA GPU is available for monitoring, reaping a query from start_gpu_query()
+    (None if it could not be launched); nvidia-smi runs at most once for the answer"""
+    global _nvidia_gpu_detected
+    if _nvidia_gpu_detected is not None:
+        return _nvidia_gpu_detected
+    if gpu_query is _GPU_NOT_QUERIED:
+        gpu_query = start_gpu_query()
+    stdout = _reap_gpu_query(gpu_query)
+    _nvidia_gpu_detected = stdout is not None
+    if _nvidia_gpu_detected:
+        context.gpu_memory_query = (time.monotonic(), stdout)
+    return _nvidia_gpu_detected
+
+def query_gpu_memory():
+    """Return nvidia-smi memory output, reusing a reading taken within the last GPU_QUERY_TTL seconds"""
+    now = time.monotonic()
+    if context.gpu_memory_query and now - context.gpu_memory_query[0] < GPU_QUERY_TTL:
+        return context.gpu_memory_query[1]
+    stdout = _reap_gpu_query(start_gpu_query())
+    context.gpu_memory_query = (now, stdout)
+    return stdout
 
 def monitor_gpu_memory():
-    """Check GPU memory usage once at startup"""
+    """Report GPU memory usage; calls within GPU_QUERY_TTL of each other share one nvidia-smi run"""
     if not context.has_nvidia_gpu:
         return
+    output = query_gpu_memory()
+    if not output:
+        return
         
     try:
-        cmd = 'nvidia-smi --query-gpu=memory.used,memory.total --format=csv,noheader,nounits'
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+        # First GPU only
+        memory_used, memory_total = map(int, output.strip().splitlines()[0].split(','))
+        usage_percent = (memory_used / memory_total) * 100
         
-        if result.returncode == 0:
-            memory_used, memory_total = map(int, result.stdout.strip().split(','))
-            usage_percent = (memory_used / memory_total) * 100
-            
-            log_message(f"GPU Memory at startup: {memory_used}MB / {memory_total}MB ({usage_percent:.1f}%)")
-            
-            if usage_percent > 80:
-                log_message(f"WARNING: GPU memory usage is high at startup: {usage_percent:.1f}%")
+        log_message(f"GPU Memory: {memory_used}MB / {memory_total}MB ({usage_percent:.1f}%)")
+        
+        if usage_percent > 80:
+            log_message(f"WARNING: GPU memory usage is high: {usage_percent:.1f}%")
     except Exception as e:
         log_message(f"Error checking GPU memory: {str(e)}")
 
@@ -752,29 +1116,28 @@ class ProcessWatchdog:
         self.process = process
         self.timeout = timeout
         self.check_interval = check_interval
-        self.last_output_time = time.time()
+        self.last_output_time = time.perf_counter()
         self.output_detected = False
         self.stop_event = threading.Event()
-        self._output_queue = queue.Queue()
+        # Set whenever output arrives; only "anything since the last check" matters
+        self._activity = threading.Event()
         
     def reset_timer(self):
         """Reset the last output time"""
-        self.last_output_time = time.time()
+        self.last_output_time = time.perf_counter()
         self.output_detected = True
+        self._activity.set()
         
     def check_process_health(self):
         """Check if process is healthy based on output and resource usage"""
-        current_time = time.time()
+        current_time = time.perf_counter()
         
         if self.process.poll() is not None:
             return False
             
-        try:
-            while True:
-                self._output_queue.get_nowait()
-                self.reset_timer()
-        except queue.Empty:
-            pass
+        if self._activity.is_set():
+            self._activity.clear()
+            self.last_output_time = current_time
             
         if current_time - self.last_output_time > self.timeout and self.output_detected:
             return False
@@ -821,112 +1184,212 @@ class ProcessWatchdog:
             self.monitor_thread.join(timeout=5)
 
 class ProcessManager:
-    """Manages process lifecycle and monitoring"""
-    def __init__(self, cmd, env=None, timeout=30):
-        self.cmd = cmd
+    """Manages the lifecycle of a piped chain of processes (e.g. vspipe | ffmpeg)"""
+    def __init__(self, stages, env=None, timeout=30):
+        self.stages = stages
         self.env = env
         self.timeout = timeout
+        self.processes = []
         self.process = None
+        self.stderr = None
         self.watchdog = None
+        self.progress_thread = None  # Thread reading self.stderr; joined in stop() before the pipe is closed
+        self._stop_lock = threading.Lock()  # stop() can race between a worker's finally and signal_handler
         
     def start(self):
-        """Start the process and monitoring"""
+        """Start every stage, chaining stdout to the next stage's stdin, and return the last one"""
         try:
-            log_message("Starting process with command: " + self.cmd)
-            self.process = subprocess.Popen(
-                self.cmd,
-                shell=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True,
-                env=self.env,
-                bufsize=1,
-                close_fds=False
-            )
-            
+            # All stages share one stderr pipe so progress and error lines arrive on a single stream
+            stderr_read, stderr_write = os.pipe()
+            # Unbuffered binary stream: monitor_progress reads it in large chunks and splits lines itself.
+            # Wrapped right away so stop() closes it even if a stage fails to start.
+            self.stderr = io.open(stderr_read, 'rb', buffering=0)
+            try:
+                upstream = None
+                last_stage = len(self.stages) - 1
+                for index, args in enumerate(self.stages):
+                    try:
+                        proc = subprocess.Popen(
+                            args,
+                            stdin=upstream.stdout if upstream else subprocess.DEVNULL,
+                            stdout=subprocess.PIPE if index < last_stage else subprocess.DEVNULL,
+                            stderr=stderr_write,
+                            env=self.env,
+                            creationflags=_CREATE_FLAGS
+                        )
+                    except Exception:
+                        # Nothing will read what the earlier stages produce, so don't leave them running
+                        if upstream:
+                            upstream.stdout.close()
+                        for started in self.processes:
+                            started.kill()
+                            started.wait()
+                        raise
+                    if upstream:
+                        # Drop our copy so the upstream stage gets SIGPIPE if this one exits early
+                        upstream.stdout.close()
+                    self.processes.append(proc)
+                    upstream = proc
+            finally:
+                os.close(stderr_write)
+            self.process = self.processes[-1]
             return self.process
         except Exception as e:
             log_message(f"Error starting process: {str(e)}", force_console=True)
+            self.stop()
             return None
     
     def stop(self):
-        """Stop the process and cleanup"""
-        if self.watchdog:
-            self.watchdog.stop()
-        if self.process and self.process.poll() is None:
-            try:
-                self.process.terminate()
+        """Stop every stage of the pipeline and cleanup"""
+        with self._stop_lock:
+            if self.watchdog:
+                self.watchdog.stop()
+            for proc in self.processes:
+                if proc.poll() is not None:
+                    continue
                 try:
-                    self.process.wait(timeout=10)
-                except subprocess.TimeoutExpired:
-                    log_message("Process didn't terminate gracefully, forcing kill", force_console=True)
-                    self.process.kill()
-            except Exception as e:
-                log_message(f"Error during process termination: {str(e)}", force_console=True)
+                    proc.terminate()
+                    try:
+                        proc.wait(timeout=10)
+                    except subprocess.TimeoutExpired:
+                        log_message(f"Process {proc.pid} didn't terminate gracefully, forcing kill", force_console=True)
+                        proc.kill()
+                except Exception as e:
+                    log_message(f"Error during process termination: {str(e)}", force_console=True)
+        
+            # Every writer has exited, so the reader hits EOF and finishes its last publish; waiting
+            # here means nothing updates this file's progress task after the caller hands it on
+            if self.progress_thread is not None and self.progress_thread is not threading.current_thread():
+                self.progress_thread.join(timeout=5)
+                if self.progress_thread.is_alive():
+                    log_message("Progress monitor did not finish after the pipeline stopped", force_console=True)
+            if self.stderr is not None:
+                try:
+                    self.stderr.close()
+                except OSError:
+                    pass
+                self.stderr = None
                 
     def is_running(self):
-        """Check if process is still running"""
-        return self.process and self.process.poll() is None
+        """Check if any stage of the pipeline is still running"""
+        return any(proc.poll() is None for proc in self.processes)
 
 def initialize_parallel():
-    """Initialize components in parallel to reduce startup time"""
-    with ThreadPoolExecutor(max_workers=4) as executor:
-        futures = []
-        
-        def init_vapoursynth():
-            try:
-                import vapoursynth as vs
-                core = vs.core
-                core.num_threads = multiprocessing.cpu_count()
-                return True
-            except Exception as e:
-                log_message(f"Error initializing VapourSynth: {str(e)}")
-                return False
-        
-        def init_filesystem():
-            try:
-                if BATCH_MODE:
-                    if not os.path.exists(INPUT_PATH):
-                        log_message(f"ERROR: Input directory does not exist: {INPUT_PATH}")
-                        return False
-                else:
-                    if not os.path.exists(INPUT_PATH):
-                        log_message(f"ERROR: Input file does not exist: {INPUT_PATH}")
-                        return False
-                    
-                if not os.path.exists(OUTPUT_DIRECTORY_PATH):
-                    try:
-                        os.makedirs(OUTPUT_DIRECTORY_PATH)
-                    except Exception as e:
-                        log_message(f"ERROR: Cannot create output directory: {str(e)}")
-                        return False
-                return True
-            except Exception as e:
-                log_message(f"Error in filesystem initialization: {str(e)}")
-                return False
-        
-        def init_logging():
-            try:
-                with open(context.log_file, 'w') as f:
-                    f.write("")
-                return True
-            except Exception as e:
-                print(f"ERROR: Cannot initialize logging: {str(e)}")
-                return False
-        
-        futures.append(executor.submit(init_vapoursynth))
-        futures.append(executor.submit(init_filesystem))
-        futures.append(executor.submit(init_logging))
-        
-        results = [f.result() for f in futures]
-        return all(results)
+    """Start the slow VapourSynth import in the background so it overlaps the rest of startup;
+    returns a function that waits for it and reports whether it succeeded"""
+    results = {}
+    
+    def init_vapoursynth():
+        try:
+            import vapoursynth as vs
+            core = vs.core
+            core.num_threads = multiprocessing.cpu_count()
+            results['vapoursynth'] = True
+        except Exception as e:
+            log_message(f"Error initializing VapourSynth: {str(e)}")
+            results['vapoursynth'] = False
+    
+    # The output directory is created and checked by main(), so the import is the only task
+    vs_thread = threading.Thread(target=init_vapoursynth, name="InitVapourSynth", daemon=True)
+    vs_thread.start()
+    
+    def wait_for_initialization():
+        # Poll so a signal arriving during the import is handled promptly
+        while vs_thread.is_alive():
+            vs_thread.join(timeout=1.0)
+            check_shutdown()
+        return results.get('vapoursynth', False)
+    
+    return wait_for_initialization
+
+class RichReporter:
+    """Per-file progress on a Rich Progress: one reusable task per worker plus the overall task"""
+    def __init__(self, progress, parallel_jobs):
+        self.progress = progress
+        # Each file borrows a free task while it runs
+        self.free_tasks = queue.Queue()
+        for _ in range(parallel_jobs):
+            self.free_tasks.put(progress.add_task("[yellow]Preparing...", total=100, speed=""))
+    
+    def file_started(self, index, file_info):
+        task_id = self.free_tasks.get()
+        # The file's name lives on its own task; the overall task is only touched once it finishes
+        self.progress.update(
+            task_id,
+            completed=0,
+            total=100,
+            description=f"[yellow]Processing: {file_info.name}",
+            speed=""
+        )
+        return task_id
+    
+    def file_finished(self, file_info, task_id, succeeded, file_time):
+        if succeeded:
+            log_message(f"✅ Successfully processed: {file_info.name}")
+        else:
+            log_message(f"❌ Failed to process: {file_info.name}")
+        self.progress.update(
+            task_id,
+            completed=100,
+            description=f"[green]Completed: {file_info.name} ({file_time/60:.1f}m)"
+        )
+    
+    def release(self, task_id):
+        self.free_tasks.put(task_id)
+    
+    def file_counted(self, file_info, files_done):
+        self.progress.update(
+            context.overall_task,
+            advance=file_info.size,
+            description=f"[cyan]Processed {files_done}/{context.total_files} files"
+        )
+
+class ConsoleReporter:
+    """Per-file progress as plain text; each report is a single write, so --parallel files don't interleave"""
+    def file_started(self, index, file_info):
+        rule = '=' * 60
+        print(f"\n{rule}\nProcessing file {index+1}/{context.total_files}: {file_info.name}\n{rule}", flush=True)
+        return None
+    
+    def file_finished(self, file_info, task_id, succeeded, file_time):
+        status = "✅ Successfully processed" if succeeded else "❌ Failed to process"
+        print(f"{status}: {file_info.name}\nFile processing time: {file_time/60:.1f} minutes", flush=True)
+    
+    def release(self, task_id):
+        pass
+    
+    def file_counted(self, file_info, files_done):
+        pass
+
+def run_batch(worker, files, parallel_jobs):
+    """Call worker(index, file_info) for every file, running at most parallel_jobs at once"""
+    if parallel_jobs <= 1:
+        for i, file_info in enumerate(files):
+            check_shutdown()
+            worker(i, file_info)
+        check_shutdown()
+        return
+    
+    executor = ThreadPoolExecutor(max_workers=parallel_jobs, thread_name_prefix="FileWorker")
+    try:
+        futures = [executor.submit(worker, i, file_info) for i, file_info in enumerate(files)]
+        pending = set(futures)
+        while pending:
+            # Wake up periodically so a pending signal is handled promptly on this thread
+            _, pending = wait(pending, timeout=1.0)
+            check_shutdown()
+        for future in futures:
+            future.result()
+    finally:
+        # On interrupt, don't start any files that are still queued
+        executor.shutdown(wait=True, cancel_futures=True)
 
 # ============================================================================
 # MAIN EXECUTION
 # ============================================================================
 
 def main():
-    global INPUT_PATH, OUTPUT_DIRECTORY_PATH, BATCH_MODE, PROCESS_SUBDIRECTORIES, TEST_MODE, TEST_FRAME_COUNT
+    global INPUT_PATH, OUTPUT_DIRECTORY_PATH, BATCH_MODE, PROCESS_SUBDIRECTORIES, TEST_MODE, TEST_FRAME_COUNT, PARALLEL_JOBS, RESERVED_CPU_CORES
 
     parser = argparse.ArgumentParser(description="HDVapourize VapourSynth Pipeline")
     parser.add_argument('--input', required=True, help='Input file or directory')
@@ -935,6 +1398,8 @@ def main():
     parser.add_argument('--recursive', action='store_true', help='Process subdirectories recursively in batch mode')
     parser.add_argument('--test_mode', action='store_true', help='Run in test mode')
     parser.add_argument('--test_frames', type=int, default=200, help='Number of frames to process in test mode')
+    parser.add_argument('--parallel', type=int, default=PARALLEL_JOBS, metavar='K', help='Number of files to process concurrently in batch mode')
+    parser.add_argument('--reserve_cores', type=int, default=RESERVED_CPU_CORES, metavar='N', help='Keep processing off the first N CPU cores')
     args = parser.parse_args()
 
     INPUT_PATH = args.input
@@ -943,25 +1408,41 @@ def main():
     PROCESS_SUBDIRECTORIES = args.recursive
     TEST_MODE = args.test_mode
     TEST_FRAME_COUNT = args.test_frames
+    PARALLEL_JOBS = max(1, args.parallel)
+    context.parallel_jobs = PARALLEL_JOBS
+    RESERVED_CPU_CORES = max(0, args.reserve_cores)
+
+    # Start the GPU query now; it runs while the inputs and output directory are set up
+    gpu_query = start_gpu_query()
+    # Likewise the VapourSynth import, which is awaited just before the batch starts
+    wait_for_initialization = initialize_parallel()
 
     # Register signal handlers
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    signal.signal(signal.SIGINT, request_shutdown)
+    signal.signal(signal.SIGTERM, request_shutdown)
 
     # Initialize timing
-    context.start_time = time.time()
-    context.batch_start_time = time.time()
-    processing_times['last_time'] = time.time()
+    context.start_time = time.perf_counter()
+    context.batch_start_time = time.perf_counter()
+    record_timing("start")
     record_timing("initialization")
 
     # Set up venv environment
     context.venv_env = setup_venv_environment()
+    context.tool_paths = resolve_tool_paths(context.venv_env)
 
     # Set up paths and determine processing mode
     if BATCH_MODE and os.path.isdir(INPUT_PATH):
         # Batch processing mode
         log_message(f"BATCH MODE: Processing directory {INPUT_PATH}")
-        context.files_to_process = find_video_files(INPUT_PATH)
+        found_files = find_video_files(INPUT_PATH)
+        
+        # Preflight with the sizes discovery already collected: an empty file can't be
+        # encoded, so report it now instead of failing partway through the batch
+        context.files_to_process = [file_info for file_info in found_files if file_info.size > 0]
+        for file_info in found_files:
+            if file_info.size == 0:
+                log_message(f"⚠️  Skipping empty file: {file_info.path}")
         context.total_files = len(context.files_to_process)
         
         if not context.files_to_process:
@@ -975,35 +1456,44 @@ def main():
         if not os.path.exists(INPUT_PATH):
             print(f"ERROR: Input file does not exist: {INPUT_PATH}")
             sys.exit(1)
-        context.files_to_process = [INPUT_PATH]
+        context.files_to_process = [make_file_info(INPUT_PATH)]
         context.total_files = 1
     else:
         print(f"ERROR: Invalid input path: {INPUT_PATH}")
         print("Path must be either a file (for single mode) or directory (for batch mode)")
         sys.exit(1)
 
+    context.total_bytes = sum(file_info.size for file_info in context.files_to_process)
     context.output_dir = OUTPUT_DIRECTORY_PATH
 
+    # This run's log folder lives inside the output directory, so creating it also
+    # creates (and checks) the output directory in a single makedirs
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    logs_dir = os.path.join(context.output_dir, f"pipeline_logs_{timestamp}")
+
     # Check network drive accessibility
-    network_drive = os.path.splitdrive(context.output_dir)[0] + '\\'
     print(f"Checking network path: {context.output_dir}")
 
     try:
-        if not os.path.exists(context.output_dir):
-            os.makedirs(context.output_dir, exist_ok=True)
+        ensure_output_directory(logs_dir)
     except Exception as e:
-        print(f"ERROR: Cannot access/create output directory: {context.output_dir}")
+        print(f"ERROR: Cannot access/create output directory: {getattr(e, 'filename', None) or context.output_dir}")
         print(f"Error details: {str(e)}")
         sys.exit(1)
 
     print(f"Output directory is accessible: {context.output_dir}")
 
-    # Create timestamp and set up logging
-    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    
-    logs_dir = os.path.join(context.output_dir, f"pipeline_logs_{timestamp}")
-    os.makedirs(logs_dir, exist_ok=True)
+    # Reuse ffprobe results from earlier runs against this output directory
+    load_probe_cache(os.path.join(context.output_dir, PROBE_CACHE_FILENAME))
+
+    # List existing outputs once so skip checks don't stat the output share per file
+    if SKIP_EXISTING and context.total_files > 1:
+        context.output_index = index_output_directory(context.output_dir)
+
+    # Set up logging
     context.run_dir = logs_dir
+    if DEBUG_MODE:
+        context.debug_log_file = os.path.join(context.run_dir, "debug_log.txt")
 
     # Set up log file
     log_filename = f"vapoursynth_batch_log_{timestamp}.txt" if BATCH_MODE else f"vapoursynth_log_{timestamp}.txt"
@@ -1018,6 +1508,10 @@ def main():
         print(f"WARNING: Cannot create log file: {str(e)}")
         context.log_file = None
 
+    # Pin once the log is open so the result lands in it, but before any probe, rewrap
+    # or encode child starts; vspipe and ffmpeg inherit the affinity
+    context.cpu_affinity = apply_cpu_affinity(RESERVED_CPU_CORES)
+
     # Initialize profiler
     if ENABLE_PERFORMANCE_PROFILING:
         try:
@@ -1028,122 +1522,125 @@ def main():
             print("Profiling modules not available - performance profiling disabled")
 
     # Initialize GPU monitoring
-    context.has_nvidia_gpu = detect_nvidia_gpu()
+    context.has_nvidia_gpu = detect_nvidia_gpu(gpu_query)
     if context.has_nvidia_gpu:
         log_message("NVIDIA GPU detected - GPU memory monitoring available")
+        if ENABLE_GPU_MONITORING:
+            monitor_gpu_memory()
     else:
         log_message("No NVIDIA GPU detected")
 
-    # Initialize parallel processing
-    if not initialize_parallel():
+    # Wait for the background initialization started at the top of main()
+    if not wait_for_initialization():
         log_message("Initialization failed. Please check the logs for details.")
         sys.exit(1)
 
     record_timing("initialization_complete")
 
+    # Probe every input up front so probe latency isn't paid inside the encode loop
+    if context.total_files > 1:
+        # ...except the ones should_skip_file will pass over anyway
+        prefetch_probes([file_info for file_info in context.files_to_process
+                         if not should_skip_file(file_info, get_output_filename(file_info, context.output_dir))])
+        record_timing("probing")
+
     # Display batch summary
     display_batch_summary()
 
+    # Files that map to the same output name must not be encoded at the same time
+    parallel_jobs = max(1, min(context.parallel_jobs, context.total_files))
+    if parallel_jobs > 1:
+        output_names = [get_output_filename(file_info, context.output_dir) for file_info in context.files_to_process]
+        if len(set(output_names)) != len(output_names):
+            log_message("WARNING: Some input files share an output filename; processing one file at a time")
+            parallel_jobs = 1
+    context.parallel_jobs = parallel_jobs
+    if parallel_jobs > 1:
+        log_message(f"Processing up to {parallel_jobs} files concurrently")
+        # Largest first (LPT scheduling): long encodes start early instead of straggling
+        # after the rest of the pool has drained. Serial runs keep the sorted-by-path order.
+        context.files_to_process.sort(key=lambda file_info: file_info.size, reverse=True)
+
+    successful_files = 0
+    failed_files = 0
+    files_done = 0
+    results_lock = threading.Lock()
+
+    def record_result(succeeded):
+        nonlocal successful_files, failed_files, files_done
+        with results_lock:
+            if succeeded:
+                successful_files += 1
+            else:
+                failed_files += 1
+            files_done += 1
+            return files_done
+
+    # Startup has been profiled; from here on only profiled_file() turns the profiler back on
+    if context.profiler is not None:
+        context.profiler.disable()
+    
+    # Warms the page cache for the file that will start after the ones now running
+    prefetch_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="Prefetch")
+    
+    def process_file(reporter, i, file_info):
+        next_index = i + parallel_jobs
+        if next_index < len(context.files_to_process):
+            prefetch_pool.submit(prefetch_input, context.files_to_process[next_index].path)
+        task_id = reporter.file_started(i, file_info)
+        try:
+            start_file_time = time.perf_counter()
+            with profiled_file(i):
+                succeeded = process_single_file(file_info, task_id)
+            reporter.file_finished(file_info, task_id, succeeded, time.perf_counter() - start_file_time)
+        finally:
+            reporter.release(task_id)
+        reporter.file_counted(file_info, record_result(succeeded))
+    
     # Start batch processing
     if BATCH_MODE and RICH_AVAILABLE:
         # Rich progress bar for batch processing
+        from rich.progress import Progress, TextColumn, BarColumn, TaskProgressColumn, TimeRemainingColumn, SpinnerColumn
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             BarColumn(),
             TaskProgressColumn(),
             TimeRemainingColumn(),
-            TextColumn("[green]{task.fields[speed]}")
+            TextColumn("[green]{task.fields[speed]}"),
+            refresh_per_second=PROGRESS_REFRESH_PER_SECOND,
+            # Redirected output can't show live redraws anyway, so skip the refresh thread
+            # that would rebuild the table every tick; the final state is still printed on exit
+            auto_refresh=sys.stdout.isatty()
         ) as progress:
             context.batch_progress = progress
             
             # Create overall progress task
             context.overall_task = progress.add_task(
                 f"[cyan]Processing {context.total_files} files...",
-                total=context.total_files,
-                speed=""
-            )
-            
-            # Create current file task (will be updated per file)
-            context.current_file_task = progress.add_task(
-                "[yellow]Preparing...",
-                total=100,
+                # Measured in input bytes so the ETA reflects file sizes, not just file count
+                total=context.total_bytes,
                 speed=""
             )
             
-            # Process each file
-            successful_files = 0
-            failed_files = 0
-            
-            for i, file_path in enumerate(context.files_to_process):
-                context.current_file_index = i
-                
-                # Update overall progress
-                progress.update(
-                    context.overall_task,
-                    completed=i,
-                    description=f"[cyan]Processing file {i+1}/{context.total_files}: {os.path.basename(file_path)}"
-                )
-                
-                # Update current file task
-                progress.update(
-                    context.current_file_task,
-                    completed=0,
-                    total=100,
-                    description=f"[yellow]Processing: {os.path.basename(file_path)}",
-                    speed=""
-                )
-                
-                # Process the file
-                start_file_time = time.time()
-                if process_single_file(file_path):
-                    successful_files += 1
-                    log_message(f"✅ Successfully processed: {os.path.basename(file_path)}")
-                else:
-                    failed_files += 1
-                    log_message(f"❌ Failed to process: {os.path.basename(file_path)}")
-                
-                file_time = time.time() - start_file_time
-                
-                # Update current file as completed
-                progress.update(
-                    context.current_file_task,
-                    completed=100,
-                    description=f"[green]Completed: {os.path.basename(file_path)} ({file_time/60:.1f}m)"
-                )
+            run_batch(partial(process_file, RichReporter(progress, parallel_jobs)), context.files_to_process, parallel_jobs)
             
             # Final update
             progress.update(
                 context.overall_task,
-                completed=context.total_files,
+                completed=context.total_bytes,
                 description=f"[green]Batch complete: {successful_files} successful, {failed_files} failed"
             )
-            
-            time.sleep(2)  # Show final status briefly
+            # Progress is non-transient, so leaving the block renders this final state and keeps it on screen
     
     else:
         # Fallback processing without Rich or single file mode
-        successful_files = 0
-        failed_files = 0
-        
-        for i, file_path in enumerate(context.files_to_process):
-            print(f"\n{'='*60}")
-            print(f"Processing file {i+1}/{context.total_files}: {os.path.basename(file_path)}")
-            print(f"{'='*60}")
-            
-            start_file_time = time.time()
-            if process_single_file(file_path):
-                successful_files += 1
-                print(f"✅ Successfully processed: {os.path.basename(file_path)}")
-            else:
-                failed_files += 1
-                print(f"❌ Failed to process: {os.path.basename(file_path)}")
-            
-            file_time = time.time() - start_file_time
-            print(f"File processing time: {file_time/60:.1f} minutes")
+        run_batch(partial(process_file, ConsoleReporter()), context.files_to_process, parallel_jobs)
+
+    prefetch_pool.shutdown(wait=False, cancel_futures=True)
 
     # Final summary
-    total_time = time.time() - context.batch_start_time
+    total_time = time.perf_counter() - context.batch_start_time
     
     print(f"\n{'='*80}")
     print("🎬 BATCH PROCESSING COMPLETE")